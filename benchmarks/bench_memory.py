@@ -0,0 +1,63 @@
+"""
+Measures the memory held by live game states.
+
+    python benchmarks/bench_memory.py [-n GAMES] [-g GUESSES]
+
+Every game is initialized from the MEDIUM tier and receives the same
+sequence of guesses, then the bytes allocated per live game are printed.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from hangman.core import init_state, update_game  # noqa: E402
+from hangman.data import Configurations, Guess  # noqa: E402
+from hangman.io import load_wordlist  # noqa: E402
+
+GUESSES = "etaoinshrdlucmfwypvbgkjqxz"
+
+
+def measure(n_games: int, n_guesses: int) -> float:
+    config = Configurations()
+    wordlist = load_wordlist()
+    # NOTE: build the tier index before measuring, it is shared by
+    # every game and should not be accounted to any of them.
+    wordlist.index(config.difficulty)
+    guesses = [Guess(c) for c in GUESSES[:n_guesses]]
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+
+    states = []
+    for _ in range(n_games):
+        state = init_state(config, wordlist)
+        for guess in guesses:
+            if not state.is_running:
+                break
+            update_game(state, guess)
+        states.append(state)
+
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (after - before) / n_games
+
+
+def main(argList):
+    parser = ArgumentParser(description="memory held by live game states")
+    parser.add_argument("-n", "--games", type=int, default=100_000)
+    parser.add_argument("-g", "--guesses", type=int, default=6)
+    args = parser.parse_args(argList)
+
+    per_game = measure(args.games, args.guesses)
+    print(f"{args.games} games, {args.guesses} guesses each: "
+          f"{per_game:.0f} bytes per game")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
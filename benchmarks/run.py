@@ -0,0 +1,265 @@
+"""
+Benchmarks of the hot paths of the game.
+
+    python benchmarks/run.py [-o results.json] [--save-baseline]
+
+Every benchmark reports the best time per call out of several repeats,
+in seconds. The results are printed as JSON and compared against
+`benchmarks/baseline.json`: a benchmark slower than its baseline by more
+than the threshold is a regression, and the exit status is 1.
+"""
+import contextlib
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from argparse import ArgumentParser
+from typing import Callable, Dict, List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from hangman.core import is_word_found, pick_word, update_game  # noqa: E402
+from hangman.data import Difficulty, Guess, State  # noqa: E402
+from hangman.io import display, load_wordlist  # noqa: E402
+from hangman.journal import RECORD, Journal, replay  # noqa: E402
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+
+Results = Dict[str, float]
+
+
+def best_time(f: Callable[[], object], repeat: int = 5) -> float:
+    """
+    Best time per call of `f`, calibrated so that a repeat takes
+    at least 0.1s.
+    """
+    timer = timeit.Timer(f)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def bench_pick_word(results: Results):
+    wordlist = load_wordlist()
+    ranges = {'all': (2, 2000), 'short': (2, 4), 'exact': (8, 8)}
+    for difficulty in Difficulty:
+        wordlist.index(difficulty)
+        for name, (lo, hi) in ranges.items():
+            results[f'pick_word.{difficulty.value}.{name}'] = best_time(
+                lambda: pick_word(lo, hi, difficulty, wordlist))
+
+
+def _long_game() -> State:
+    # a 2000 characters word made of all the letters
+    word = ('abcdefghijklmnopqrstuvwxy' * 80)[:2000]
+    state = State(target_word=word, current_lives=10)
+    for c in 'abcdefghijklmnopqrstuvwx':
+        update_game(state, Guess(c))
+    return state
+
+
+def bench_update_game(results: Results):
+    def play_long_game():
+        state = _long_game()
+        update_game(state, Guess('y'))
+        assert state.is_victory
+
+    results['update_game.long_word'] = best_time(play_long_game)
+
+    state = _long_game()
+    results['is_word_found.long_word'] = best_time(
+        lambda: is_word_found(state))
+
+
+def bench_display(results: Results):
+    state = _long_game()
+    short = State(target_word='penguin', current_lives=5,
+                  guesses=[Guess('p'), Guess('n')])
+    for name, game in (('long_word', state), ('short_word', short)):
+        def render():
+            with contextlib.redirect_stdout(io.StringIO()):
+                display(game)
+        results[f'display.{name}'] = best_time(render)
+
+
+def bench_load_wordlist(results: Results):
+    def cold():
+        load_wordlist.cache_clear()
+        wordlist = load_wordlist()
+        wordlist.index(Difficulty.MEDIUM)
+
+    results['load_wordlist.cold'] = best_time(cold, repeat=3)
+    load_wordlist()
+    results['load_wordlist.warm'] = best_time(load_wordlist)
+
+
+def bench_replay(results: Results, games: int = 20000):
+    words = load_wordlist().index(Difficulty.MEDIUM).words
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'games.journal')
+        with Journal(path, flush_every=4096) as journal:
+            for i in range(games):
+                state = State(
+                    target_word=words[i * 7919 % len(words)],
+                    current_lives=10)
+                game = journal.start(state)
+                for c in 'etaoinshrdlucmfwypvbgkqjxz':
+                    if not state.is_running:
+                        break
+                    update_game(state, Guess(c))
+                    journal.guess(game, state, Guess(c))
+                journal.end(game, state)
+        events = os.path.getsize(path) // RECORD.size
+        results['replay.per_event'] = best_time(
+            lambda: replay(path), repeat=3) / events
+
+
+def bench_startup(results: Results, runs: int = 10):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, 'main.py', '--help'],
+            cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        times.append(time.perf_counter() - start)
+    results['startup.help'] = min(times)
+
+
+# the startup-optimized executable, once built with `build-linux-fast`
+EXECUTABLE = os.path.join(
+    ROOT, 'dist', 'hangman-cli_linux_x64', 'hangman-cli_linux_x64')
+
+
+def time_first_game(
+    command: List[str],
+    cwd: str,
+    env: Dict[str, str]
+) -> float:
+    """
+    Time from the start of the process to the first game being shown.
+    """
+    start = time.perf_counter()
+    game = subprocess.Popen(
+        command, cwd=cwd, env=env, text=True,
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+    assert game.stdout is not None
+    for line in game.stdout:
+        if line.startswith('Word: '):
+            break
+    elapsed = time.perf_counter() - start
+    # NOTE(andrea): closing the input quits the game
+    game.communicate()
+    return elapsed
+
+
+def bench_embedded_startup(results: Results, runs: int = 10):
+    # NOTE(andrea): run from a folder without assets, so that the
+    # embedded wordlists are used, like in the built executable.
+    if not os.path.exists(os.path.join(ROOT, 'hangman', '_wordlists_data.py')):
+        print("skipping startup.embedded, run `pipenv run embed-wordlists`",
+              file=sys.stderr)
+        return
+    launches = {
+        'startup.embedded': [sys.executable, os.path.join(ROOT, 'main.py')],
+    }
+    if os.path.exists(EXECUTABLE):
+        launches['startup.executable'] = [EXECUTABLE]
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    with tempfile.TemporaryDirectory() as cwd:
+        for name, command in launches.items():
+            results[name] = min(
+                time_first_game(command, cwd, env) for _ in range(runs))
+
+
+BENCHMARKS = [
+    bench_pick_word,
+    bench_update_game,
+    bench_display,
+    bench_load_wordlist,
+    bench_replay,
+    bench_startup,
+    bench_embedded_startup,
+]
+
+
+def compare(
+    results: Results,
+    baseline: Results,
+    threshold: float
+) -> List[str]:
+    """
+    Returns a description of every benchmark slower than its baseline
+    by more than `threshold` (e.g. 0.25 for 25%).
+    """
+    regressions = []
+    for name, value in sorted(results.items()):
+        reference = baseline.get(name)
+        if reference is None or reference <= 0:
+            continue
+        ratio = value / reference
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"{name}: {value:.3e}s vs {reference:.3e}s ({ratio:.2f}x)")
+    return regressions
+
+
+def main(argList: List[str]) -> int:
+    parser = ArgumentParser(description="benchmarks of the game")
+    parser.add_argument(
+        "-o", "--output", help="also writes the results to this file")
+    parser.add_argument(
+        "--baseline", default=BASELINE,
+        help="results to compare against (default: benchmarks/baseline.json)")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25,
+        help="tolerated slowdown, as a fraction (default: 0.25)")
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="stores the results in the baseline")
+    parser.add_argument(
+        "-k", dest="only", default="",
+        help="runs only the benchmarks whose name contains this string")
+    args = parser.parse_args(argList)
+
+    results: Results = {}
+    for bench in BENCHMARKS:
+        if args.only in bench.__name__:
+            bench(results)
+
+    dump = json.dumps(results, indent=2, sort_keys=True)
+    print(dump)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(dump + '\n')
+
+    if args.save_baseline:
+        # NOTE(andrea): with -k only some benchmarks ran, the others keep
+        # their previous baseline
+        saved: Results = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                saved = json.load(f)
+        saved.update(results)
+        with open(args.baseline, 'w') as f:
+            f.write(json.dumps(saved, indent=2, sort_keys=True) + '\n')
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("no baseline to compare against", file=sys.stderr)
+        return 0
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"regression: {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,141 @@
+"""
+Non-interactive batch mode. Reads one game per line (JSON Lines) and
+writes one result per game, without prompts nor animations.
+
+Every input record has the guesses of the game and either the word to
+guess or the seed used to pick it from the configured tier:
+
+    {"seed": 42, "guesses": ["e", "a", "penguin"]}
+    {"word": "penguin", "guesses": ["p", "x"]}
+
+and every output record sums up the game:
+
+    {"word": "penguin", "seed": null, "victory": false, "finished": false,
+     "lives": 9, "guesses": 2, "revealed": "p______", "rejected": 0}
+
+Guesses that are not legal, or were already made, are counted as
+`rejected` and skipped. Guesses after the end of the game are ignored.
+Lines that are not a valid game (e.g. a word that is not made of
+lowercase ASCII letters) get an error record instead:
+
+    {"line": 3, "error": "the guesses must be a list"}
+"""
+import json
+import random
+import sys
+from typing import IO, Any, Dict, List, Optional
+
+from hangman.core import init_state, update_game
+from hangman.data import Configurations, State, WordList
+from hangman.io import load_wordlist, parse_guess
+
+# number of result records written at once
+FLUSH_EVERY = 1024
+
+
+def _is_game_word(word: str) -> bool:
+    return len(word) > 0 and all(97 <= ord(c) <= 122 for c in word)
+
+
+def play_record(
+    record: Dict[str, Any],
+    config: Configurations,
+    wordlist: WordList
+) -> Dict[str, Any]:
+    """
+    Plays the game described by an input record and returns its result.
+    Raises `ValueError` if the record is not a valid game.
+    """
+    seed = record.get('seed')
+    word = record.get('word')
+    guesses = record.get('guesses', [])
+    if seed is not None and (
+            not isinstance(seed, int) or isinstance(seed, bool)):
+        raise ValueError("the seed must be an integer")
+    if word is not None and (
+            not isinstance(word, str) or not _is_game_word(word)):
+        raise ValueError("the word must be made of lowercase ASCII letters")
+    if not isinstance(guesses, list):
+        raise ValueError("the guesses must be a list")
+
+    if word is not None:
+        state = State(target_word=word, current_lives=config.lives)
+    else:
+        state = init_state(config, wordlist, random.Random(seed))
+
+    applied = rejected = 0
+    for raw in guesses:
+        if not state.is_running:
+            break
+        try:
+            guess = parse_guess(state, str(raw))
+        except ValueError:
+            rejected += 1
+            continue
+        # NOTE(andrea): update_game would print a notice on stdout,
+        # which is where the results go.
+        if state.has_guessed(guess):
+            rejected += 1
+            continue
+        update_game(state, guess)
+        applied += 1
+
+    return {
+        'word': state.target_word,
+        'seed': seed,
+        'victory': state.is_victory,
+        'finished': not state.is_running,
+        'lives': state.current_lives,
+        'guesses': applied,
+        'revealed': ''.join(state.revealed),
+        'rejected': rejected,
+    }
+
+
+def run_batch(
+    config: Configurations,
+    source: IO[str],
+    out: IO[str],
+    wordlist: Optional[WordList] = None
+) -> int:
+    """
+    Plays every game of `source` and writes the results to `out`.
+    Returns the number of games played.
+    """
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
+
+    pending: List[str] = []
+    n_games = 0
+    try:
+        for n_line, line in enumerate(source, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError("a game must be a JSON object")
+                result = play_record(record, config, wordlist)
+                n_games += 1
+            except ValueError as e:
+                result = {'line': n_line, 'error': str(e)}
+
+            pending.append(json.dumps(result))
+            if len(pending) >= FLUSH_EVERY:
+                out.write('\n'.join(pending) + '\n')
+                pending.clear()
+    finally:
+        # NOTE(andrea): written even if the batch is interrupted, so that
+        # the games played so far are not lost.
+        if pending:
+            out.write('\n'.join(pending) + '\n')
+        out.flush()
+    return n_games
+
+
+def run(config: Configurations):
+    if config.batch is None or config.batch == '-':
+        run_batch(config, sys.stdin, sys.stdout)
+        return
+    with open(config.batch, 'r') as f:
+        run_batch(config, f, sys.stdout)
@@ -2,6 +2,41 @@ MAX_LIVES: int = 10
 MIN_LENGTH: int = 2
 MAX_LENGTH: int = 2000
 
+DEFAULT_LANG: str = 'BRITISH'
+DEFAULT_ADDRESS: str = '127.0.0.1:7878'
+
+# NOTE(andrea): relative frequency of every letter in English words. The
+# difficulty score of a word is the sum of the inverse frequencies of
+# its letters, see `scripts/classifier.py`.
+LETTER_FREQUENCIES = {
+    "E": 56.88,
+    "M": 15.36,
+    "A": 43.31,
+    "H": 15.31,
+    "R": 38.64,
+    "G": 12.59,
+    "I": 38.45,
+    "B": 10.56,
+    "O": 36.51,
+    "F": 9.24,
+    "T": 35.43,
+    "Y": 9.06,
+    "N": 33.92,
+    "W": 6.57,
+    "S": 29.23,
+    "K": 5.61,
+    "L": 27.98,
+    "V": 5.13,
+    "C": 23.13,
+    "X": 1.48,
+    "U": 18.51,
+    "Z": 1.39,
+    "D": 17.25,
+    "J": 1.00,
+    "P": 16.14,
+    "Q": 1,
+}
+
 ANIMATIONS = [
     '''
    --------
@@ -1,79 +1,193 @@
 import random
-from typing import List
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
 from hangman.data import Configurations, Difficulty, Guess, State, WordList
+from hangman.dealer import WordDealer
+from hangman.index import LengthIndex
 from hangman.io import load_wordlist, print_error, print_info
+from hangman.patterns import PatternIndex
+from hangman.profiling import profiled
 
+if TYPE_CHECKING:
+    from hangman.solver import Solver
 
+
+@profiled('pick_word')
 def pick_word(
     min_length: int,
     max_length: int,
     difficulty: Difficulty,
-    wordlist: WordList = load_wordlist()
+    wordlist: Optional[WordList] = None,
+    rng: Optional[random.Random] = None,
+    difficulty_range: Optional[Tuple[float, float]] = None
 ) -> str:
+    """
+    Picks a word of the given tier, or of the given percentile band of
+    difficulty scores across all tiers, within the length range.
+    """
     # NOTE(andrea): this should never fail, so no default should be needed.
     # pick_word should choose a wordlist based on difficulty (and maybe
     # a language configuration?). So, besides from testing, there is no need to
     # pass the list as an argument. We can just use BRITISH as a default.
-    target_list: List[str] = getattr(wordlist, difficulty.value, [])
+    if wordlist is None:
+        wordlist = load_wordlist()
+    try:
+        if difficulty_range is not None:
+            return wordlist.score_index().pick(
+                min_length, max_length, *difficulty_range, rng=rng)
+        return wordlist.index(difficulty).pick(min_length, max_length, rng)
+    except IndexError:
+        print_error("No word found for given configuration.")
+        raise ValueError("No word found for given configuration.")
 
-    filtered_target_list = list(filter(
-        lambda w: min_length <= len(w) <= max_length, target_list))
 
-    if len(filtered_target_list) <= 0:
+def make_dealer(
+    config: Configurations,
+    wordlist: Optional[WordList] = None
+) -> WordDealer:
+    """
+    Returns a dealer of the words matching the configuration, seeded
+    with `config.seed`.
+    """
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
+    if config.difficulty_range is not None:
+        pool = wordlist.score_index().select(
+            config.min_length, config.max_length, *config.difficulty_range)
+    else:
+        pool = wordlist.index(config.difficulty).select(
+            config.min_length, config.max_length)
+    try:
+        return WordDealer(pool, config.seed)
+    except IndexError:
         print_error("No word found for given configuration.")
         raise ValueError("No word found for given configuration.")
 
-    return random.choice(filtered_target_list)
 
-
-def init_state(config: Configurations) -> State:
+def make_index(
+    config: Configurations,
+    wordlist: Optional[WordList] = None
+) -> LengthIndex:
+    """
+    Returns the length index of the words the configuration picks from:
+    its tier, or all the tiers when picking by percentile.
+    """
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
+    if config.difficulty_range is not None:
+        scores = wordlist.score_index()
+        return LengthIndex.from_buckets(
+            scores, scores.lengths, scores.offsets)
+    return wordlist.index(config.difficulty)
+
+
+class Hint:
+    """
+    Suggests the next letter of the games of a configuration, or `None`
+    when there is no suggestion. Uses `hangman.solver` when numpy is
+    installed, and the bitsets of `hangman.patterns` otherwise.
+    """
+
+    def __init__(
+        self,
+        config: Configurations,
+        wordlist: Optional[WordList] = None
+    ):
+        self.config = config
+        self.wordlist = wordlist
+        self._solver: Optional[Union['Solver', PatternIndex]] = None
+
+    def solver(self) -> Union['Solver', PatternIndex]:
+        if self._solver is None:
+            index = make_index(self.config, self.wordlist)
+            # NOTE(andrea): imported here, so that loading the game does
+            # not pay for loading numpy.
+            try:
+                from hangman.solver import Solver
+            except ImportError:
+                self._solver = PatternIndex(index)
+            else:
+                self._solver = Solver(index)
+        return self._solver
+
+    def prepare(self, state: State):
+        """
+        Builds the tables of the length of the word of `state`, so that
+        the first hint of its game is immediate.
+        """
+        self.solver().prepare(len(state.target_word))
+
+    def __call__(self, state: State) -> Optional[str]:
+        return self.solver().best_letter(state)
+
+
+def make_hint(
+    config: Configurations,
+    wordlist: Optional[WordList] = None
+) -> Hint:
+    """
+    Returns the hints of the games with the configuration. See `Hint`.
+    """
+    return Hint(config, wordlist)
+
+
+def init_state(
+    config: Configurations,
+    wordlist: Optional[WordList] = None,
+    rng: Optional[random.Random] = None,
+    dealer: Optional[WordDealer] = None
+) -> State:
+    """
+    Starts a new game. The word is dealt by `dealer` if given, and
+    picked at random otherwise.
+    """
+    if dealer is not None:
+        return State(target_word=dealer.deal(), current_lives=config.lives)
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
     target_word = pick_word(
         config.min_length,
         config.max_length,
         config.difficulty,
+        wordlist,
+        rng,
+        config.difficulty_range,
     )
     return State(target_word=target_word, current_lives=config.lives)
 
 
 def is_word_found(game_state: State) -> bool:
-    for c in game_state.target_word:
-        try:
-            next(g for g in game_state.guesses if g.guess == c)
-        except StopIteration:
-            return False
-    return True
+    return game_state.hidden == 0
 
 
+@profiled('update_game')
 def update_game(game_state: State, guess: Guess):
-    try:
-        next(g for g in game_state.guesses if g.guess == guess.guess)
+    if game_state.has_guessed(guess):
         print_info("you already input this, try a different word/character")
         return
-    except StopIteration:
-        pass
+    apply_guess(game_state, guess)
 
+
+def apply_guess(game_state: State, guess: Guess):
+    """
+    Applies a guess that was not made before, following the rules of the
+    game. Unlike `update_game`, duplicates are not checked.
+    """
     game_state.current_guess = guess
-    game_state.guesses.append(guess)
+    found = game_state.add_guess(guess)
+
+    if guess.whole_word:
+        won = game_state.target_word == guess.guess
+        missed = not won
+    else:
+        missed = found == 0
+        won = not missed and is_word_found(game_state)
 
-    def win():
+    if won:
         game_state.is_running = False
         game_state.is_victory = True
-
-    def take_life():
+    elif missed:
         game_state.current_lives -= 1
         if game_state.current_lives == 0:
             game_state.is_running = False
             game_state.is_victory = False
-
-    if guess.whole_word:
-        if game_state.target_word == guess.guess:
-            win()
-        else:
-            take_life()
-    else:
-        if game_state.target_word.find(guess.guess) != -1:
-            if is_word_found(game_state):
-                win()
-        else:
-            take_life()
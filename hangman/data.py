@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from enum import Enum, unique
-from typing import List, Optional
+from typing import (Callable, Dict, Iterable, Iterator, List, Optional,
+                    Sequence, Tuple)
 
-from hangman.constants import MAX_LENGTH, MAX_LIVES, MIN_LENGTH
+from hangman.constants import DEFAULT_LANG, MAX_LENGTH, MAX_LIVES, MIN_LENGTH
+from hangman.index import LengthIndex, ScoreIndex
+from hangman.utils import slotted
 
 
 @unique
@@ -18,9 +21,87 @@ class WordList:
     Describes a list of words divided into three categories:
     easy, medium, and hard.
     """
-    easy: List[str]
-    medium: List[str]
-    hard: List[str]
+    easy: Sequence[str]
+    medium: Sequence[str]
+    hard: Sequence[str]
+    # loads every lazy tier at once, for the queries that read them all
+    load_all: Optional[Callable[[], Dict[str, Sequence[str]]]] = field(
+        default=None, repr=False, compare=False)
+    _indexes: Dict[Difficulty, LengthIndex] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _score_index: Optional[ScoreIndex] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def index(self, difficulty: Difficulty) -> LengthIndex:
+        """
+        Returns the length index of the given tier. It is built on first
+        use and reused for the lifetime of the wordlist.
+        """
+        try:
+            return self._indexes[difficulty]
+        except KeyError:
+            index = LengthIndex.of(getattr(self, difficulty.value, []))
+            self._indexes[difficulty] = index
+            return index
+
+    def score_index(self) -> ScoreIndex:
+        """
+        Returns the index of the words of all the tiers by difficulty
+        score. It is built on first use, since it reads every word.
+        """
+        if self._score_index is None:
+            tiers = [getattr(self, d.value) for d in Difficulty]
+            if self.load_all is not None and any(
+                isinstance(t, LazyTier) and not t.is_loaded for t in tiers
+            ):
+                loaded = self.load_all()
+                for d, tier in zip(Difficulty, tiers):
+                    if isinstance(tier, LazyTier):
+                        tier.provide(loaded[d.value])
+            self._score_index = ScoreIndex(
+                [self.index(d) for d in Difficulty])
+        return self._score_index
+
+
+class LazyTier(Sequence[str]):
+    """
+    A difficulty tier whose words are loaded by `loader` the first
+    time they are accessed.
+    """
+
+    __slots__ = ('_loader', '_words')
+
+    def __init__(self, loader: Callable[[], Sequence[str]]):
+        self._loader = loader
+        self._words: Optional[Sequence[str]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._words is not None
+
+    def provide(self, words: Sequence[str]):
+        """
+        Sets the words of the tier, unless they were loaded already.
+        """
+        if self._words is None:
+            self._words = words
+
+    def resolve(self) -> Sequence[str]:
+        if self._words is None:
+            self._words = self._loader()
+        return self._words
+
+    def __len__(self) -> int:
+        return len(self.resolve())
+
+    def __getitem__(self, i):
+        return self.resolve()[i]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.resolve())
+
+    def length_index(self) -> LengthIndex:
+        return LengthIndex.of(self.resolve())
 
 
 @dataclass(frozen=True)
@@ -33,8 +114,38 @@ class Configurations:
     min_length: int = MIN_LENGTH
     max_length: int = MAX_LENGTH
     difficulty: Difficulty = Difficulty.MEDIUM
+    lang: str = DEFAULT_LANG
+    # address to serve games on, `None` for a local game
+    serve: Optional[str] = None
+    # file of games to play in batch mode, '-' for stdin
+    batch: Optional[str] = None
+    # file to record game events to, see `hangman.journal`
+    journal: Optional[str] = None
+    # profiling mode, see `hangman.profiling`
+    profile: Optional[str] = None
+    # seed of the order words are dealt in, `None` for a random one
+    seed: Optional[int] = None
+    # percentile band of difficulty scores to pick words from, across
+    # all the tiers; when set, `difficulty` is ignored
+    difficulty_range: Optional[Tuple[float, float]] = None
+    # database to record the games to, see `hangman.stats`
+    record: Optional[str] = None
+    # database to print the statistics of, instead of playing
+    stats: Optional[str] = None
 
+    @property
+    def difficulty_label(self) -> str:
+        """
+        The difficulty words are picked with: the tier, or the percentile
+        band when `difficulty_range` is set, e.g. `0.8-0.95`.
+        """
+        if self.difficulty_range is None:
+            return self.difficulty.value
+        low, high = self.difficulty_range
+        return f"{low:g}-{high:g}"
 
+
+@slotted
 @dataclass(eq=True, frozen=True)
 class Guess:
     """
@@ -45,16 +156,117 @@ class Guess:
     whole_word: bool = False
 
 
-@dataclass(eq=True)
+def _bit(c: str) -> int:
+    """
+    Bit of a character in `State.letters`: lowercase ASCII letters take
+    the lowest 26 bits, any other character is placed after them.
+    """
+    code = ord(c)
+    if 97 <= code <= 122:
+        return 1 << (code - 97)
+    return 1 << (code + 26)
+
+
+@slotted
+@dataclass(init=False, eq=True)
 class State:
     """
     The state of the system describes the to be guessed word,
     all the wrongly guessed characters, the current progress of the word,
     the number of Lives and the configuration options.
+
+    To keep live games small, the guessed characters are stored as a
+    bitmask (`letters`) and as a string in the order they were guessed
+    (`history`), and only whole-word attempts are kept as separate
+    strings (`words`); `guesses` rebuilds the list of `Guess` objects
+    on access.
+    The bookkeeping fields (`hidden` and `revealed`) are derived from
+    `target_word` and the initial guesses, and are kept up to date by
+    `hangman.core.update_game`.
     """
     target_word: str
     current_lives: int
-    current_guess: Optional[Guess] = None
-    guesses: List[Guess] = field(default_factory=lambda: [])
-    is_running: bool = True
-    is_victory: bool = False
+    current_guess: Optional[Guess]
+    is_running: bool
+    is_victory: bool
+    # one bit per guessed character, see `_bit`
+    letters: int
+    # every guessed character, in the order they were guessed
+    history: str
+    # every whole-word attempt
+    words: Tuple[str, ...]
+    # number of characters guessed before each whole-word attempt
+    word_turns: Tuple[int, ...] = field(repr=False)
+    # number of positions of the target word that are still hidden
+    hidden: int = field(repr=False, compare=False)
+    # the target word as shown to the player, '_' for hidden characters
+    revealed: List[str] = field(repr=False, compare=False)
+
+    def __init__(
+        self,
+        target_word: str,
+        current_lives: int,
+        current_guess: Optional[Guess] = None,
+        guesses: Iterable[Guess] = (),
+        is_running: bool = True,
+        is_victory: bool = False
+    ):
+        self.target_word = target_word
+        self.current_lives = current_lives
+        self.current_guess = current_guess
+        self.is_running = is_running
+        self.is_victory = is_victory
+        self.letters = 0
+        self.history = ''
+        self.words = ()
+        self.word_turns = ()
+        self.hidden = len(target_word)
+        self.revealed = ['_'] * len(target_word)
+        for guess in guesses:
+            self.add_guess(guess)
+
+    @property
+    def guesses(self) -> List[Guess]:
+        """
+        Every guess, in the order they were made. The list is rebuilt on
+        every access, so changing it does not change the state: new
+        guesses go through `add_guess`.
+        """
+        out: List[Guess] = []
+        done = 0
+        for turn, word in zip(self.word_turns, self.words):
+            out.extend(Guess(c) for c in self.history[done:turn])
+            out.append(Guess(word, whole_word=True))
+            done = turn
+        out.extend(Guess(c) for c in self.history[done:])
+        return out
+
+    def has_guessed(self, guess: Guess) -> bool:
+        if guess.whole_word:
+            return guess.guess in self.words
+        return bool(self.letters & _bit(guess.guess))
+
+    def add_guess(self, guess: Guess) -> int:
+        """
+        Records a guess and reveals the positions of the target word it
+        matches. Returns the number of revealed positions.
+        """
+        if guess.whole_word:
+            self.words += (guess.guess,)
+            self.word_turns += (len(self.history),)
+            return 0
+
+        c = guess.guess
+        bit = _bit(c)
+        if self.letters & bit:
+            return 0
+        self.letters |= bit
+        self.history += c
+        found = 0
+        i = self.target_word.find(c)
+        while i != -1:
+            self.revealed[i] = c
+            found += 1
+            i = self.target_word.find(c, i + 1)
+        self.hidden -= found
+        return found
@@ -0,0 +1,68 @@
+import random
+from typing import Dict, Optional, Sequence
+
+from hangman.profiling import profiled
+
+
+class WordDealer:
+    """
+    Deals the words of a pool (e.g. a `Selection` of an index) in a
+    random order, without repeats until every word of the pool has been
+    dealt; then starts over with a new order, which does not start with
+    the last word dealt. Two dealers with the same seed deal the same
+    words.
+    """
+
+    __slots__ = ('_words', '_size', '_rng', '_dealt', '_swaps', '_last')
+
+    def __init__(self, pool: Sequence[str], seed: Optional[int] = None):
+        if len(pool) <= 0:
+            raise IndexError("empty pool")
+        self._words = pool
+        self._size = len(pool)
+        self._rng = random.Random(seed)
+        self._dealt = 0
+        # NOTE(andrea): a Fisher-Yates shuffle of the pool, run one step
+        # per deal. Only the positions that were swapped are stored, so
+        # the permutation is never materialized and every deal is O(1).
+        self._swaps: Dict[int, int] = {}
+        # position of the last word dealt
+        self._last = -1
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def remaining(self) -> int:
+        """
+        Number of words left before the dealer starts over.
+        """
+        return self._size - self._dealt
+
+    @profiled('deal_word')
+    def deal(self) -> str:
+        if self._dealt == self._size:
+            self._dealt = 0
+            self._swaps.clear()
+            if self._size > 1:
+                # NOTE(andrea): the first word of the new round is drawn
+                # among the others, the rest of the order stays uniform.
+                j = self._rng.randrange(self._size - 1)
+                return self._deal(j if j < self._last else j + 1)
+
+        k = self._dealt
+        return self._deal(k + self._rng.randrange(self._size - k))
+
+    def _deal(self, j: int) -> str:
+        """
+        Deals the word at position `j` of the remaining permutation.
+        """
+        k = self._dealt
+        swaps = self._swaps
+        # position k is never read again, so its entry can go
+        picked = swaps.pop(k, k)
+        if j != k:
+            picked, swaps[j] = swaps.get(j, j), picked
+        self._dealt = k + 1
+        self._last = picked
+        return self._words[picked]
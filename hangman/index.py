@@ -0,0 +1,303 @@
+import math
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import repeat
+from typing import Dict, List, Optional, Sequence, Tuple, overload
+
+from hangman.constants import LETTER_FREQUENCIES
+
+_LETTER_SCORES = {
+    c: 1 / freq
+    for letter, freq in LETTER_FREQUENCIES.items()
+    for c in (letter, letter.lower())
+}
+
+
+def word_score(word: str) -> float:
+    """
+    The difficulty score of a word: the sum of the inverse frequencies
+    of its letters. Other characters add nothing.
+    """
+    return sum(map(_LETTER_SCORES.get, word, repeat(0.0)))
+
+
+class Selection(Sequence[str]):
+    """
+    Read-only view over some runs of a sequence of words, as if they
+    were a single sequence.
+    """
+
+    __slots__ = ('_words', '_starts', '_offsets')
+
+    def __init__(self, words: Sequence[str], runs: Sequence[range]):
+        self._words = words
+        self._starts: List[int] = []
+        self._offsets: List[int] = [0]
+        for run in runs:
+            if len(run) > 0:
+                self._starts.append(run.start)
+                self._offsets.append(self._offsets[-1] + len(run))
+
+    def __len__(self) -> int:
+        return self._offsets[-1]
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("selection index out of range")
+        run = bisect_right(self._offsets, i) - 1
+        return self._words[self._starts[run] + i - self._offsets[run]]
+
+
+class LengthIndex:
+    """
+    Groups the words of a single tier by length. The words are kept
+    sorted by length, so every `[min_length, max_length]` query maps to
+    a contiguous slice that is found with two bisects.
+    """
+
+    __slots__ = ('words', 'lengths', 'offsets')
+
+    def __init__(self, words: Sequence[str]):
+        self.words: Sequence[str] = sorted(words, key=len)
+        # NOTE(andrea): `lengths` holds every distinct word length in
+        # ascending order and `offsets[i]` is the position of the first
+        # word of length `lengths[i]`. The last offset is the total count.
+        self.lengths: List[int] = []
+        self.offsets: List[int] = []
+        for i, word in enumerate(self.words):
+            if not self.lengths or self.lengths[-1] != len(word):
+                self.lengths.append(len(word))
+                self.offsets.append(i)
+        self.offsets.append(len(self.words))
+
+    @classmethod
+    def from_buckets(
+        cls,
+        words: Sequence[str],
+        lengths: List[int],
+        offsets: List[int]
+    ) -> 'LengthIndex':
+        """
+        Wraps words that are already sorted by length, given their
+        distinct lengths and the offset of each length bucket.
+        """
+        index = cls.__new__(cls)
+        index.words = words
+        index.lengths = lengths
+        index.offsets = offsets
+        return index
+
+    @classmethod
+    def of(cls, words: Sequence[str]) -> 'LengthIndex':
+        """
+        Builds the index of a tier, reusing the bucket tables of tiers
+        that are stored grouped by length.
+        """
+        length_index = getattr(words, 'length_index', None)
+        if length_index is None:
+            return cls(words)
+        index: LengthIndex = length_index()
+        return index
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def min_length(self) -> int:
+        return self.lengths[0] if self.lengths else 0
+
+    @property
+    def max_length(self) -> int:
+        return self.lengths[-1] if self.lengths else 0
+
+    def histogram(self) -> Dict[int, int]:
+        """
+        Returns the number of words of each length.
+        """
+        return {
+            length: self.offsets[i + 1] - self.offsets[i]
+            for i, length in enumerate(self.lengths)
+        }
+
+    def span(self, min_length: int, max_length: int) -> range:
+        """
+        Returns the positions of the words whose length is within
+        `[min_length, max_length]`.
+        """
+        lo = bisect_left(self.lengths, min_length)
+        hi = bisect_right(self.lengths, max_length)
+        if lo >= hi:
+            return range(0)
+        return range(self.offsets[lo], self.offsets[hi])
+
+    def count(self, min_length: int, max_length: int) -> int:
+        return len(self.span(min_length, max_length))
+
+    def select(self, min_length: int, max_length: int) -> Selection:
+        return Selection(self.words, [self.span(min_length, max_length)])
+
+    def scores(self) -> Sequence[float]:
+        """
+        Returns the difficulty score of every word, in index order.
+        Scores stored with the words are used when available.
+        """
+        stored = getattr(self.words, 'scores', None)
+        if stored is not None:
+            scores: Optional[Sequence[float]] = stored()
+            if scores is not None:
+                return scores
+        return array('f', map(word_score, self.words))
+
+    def pick(
+        self,
+        min_length: int,
+        max_length: int,
+        rng: Optional[random.Random] = None
+    ) -> str:
+        """
+        Picks a word uniformly among the ones within the length range,
+        using `rng` or the global generator. Raises `IndexError` if there
+        is none.
+        """
+        span = self.span(min_length, max_length)
+        if len(span) <= 0:
+            raise IndexError("empty length range")
+        randrange = rng.randrange if rng is not None else random.randrange
+        return self.words[span.start + randrange(len(span))]
+
+
+class ScoreIndex(Sequence[str]):
+    """
+    Ranks the words of one or more tiers by difficulty score. The words
+    are grouped by length and every group is sorted by score, so every
+    query on a length range and a score band maps to one contiguous run
+    per length, found with bisects.
+    """
+
+    __slots__ = ('_tiers', '_bases', 'lengths', 'offsets', 'scores', 'refs',
+                 'ranked')
+
+    def __init__(self, tiers: Sequence[LengthIndex]):
+        self._tiers = list(tiers)
+        self._bases: List[int] = []
+        # NOTE(andrea): every word is referred to by its position across
+        # the tiers, `refs` locates the word of every entry of the index.
+        scores = array('f')
+        by_length: Dict[int, List[int]] = {}
+        for index in self._tiers:
+            base = len(scores)
+            self._bases.append(base)
+            scores.extend(index.scores())
+            for i, length in enumerate(index.lengths):
+                by_length.setdefault(length, []).extend(range(
+                    base + index.offsets[i], base + index.offsets[i + 1]))
+
+        # NOTE(andrea): like in `LengthIndex`, `offsets[i]` is the
+        # position of the first entry of length `lengths[i]`.
+        self.lengths: List[int] = sorted(by_length)
+        self.offsets: List[int] = []
+        self.refs = array('L')
+        for length in self.lengths:
+            group = by_length[length]
+            group.sort(key=scores.__getitem__)
+            self.offsets.append(len(self.refs))
+            self.refs.extend(group)
+        self.offsets.append(len(self.refs))
+        self.scores = array('f', map(scores.__getitem__, self.refs))
+        # all the scores in ascending order, to map percentiles to scores
+        self.ranked = array('f', sorted(scores))
+
+    def __len__(self) -> int:
+        return len(self.refs)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        ref = self.refs[i]
+        tier = bisect_right(self._bases, ref) - 1
+        return self._tiers[tier].words[ref - self._bases[tier]]
+
+    def bounds(self, low: float, high: float) -> Tuple[float, float]:
+        """
+        Returns the scores `[lower, upper)` of the words whose percentile
+        is within `[low, high)`, with `0 <= low < high <= 1`.
+        """
+        n = len(self.ranked)
+        lo = min(math.floor(low * n), n)
+        hi = math.floor(high * n)
+        lower = self.ranked[lo] if lo < n else math.inf
+        upper = self.ranked[hi] if hi < n else math.inf
+        return lower, upper
+
+    def runs(
+        self,
+        min_length: int,
+        max_length: int,
+        low: float,
+        high: float
+    ) -> List[range]:
+        """
+        Returns the positions of the words whose length is within
+        `[min_length, max_length]` and whose percentile is within
+        `[low, high)`, as one run per length.
+        """
+        lower, upper = self.bounds(low, high)
+        first = bisect_left(self.lengths, min_length)
+        last = bisect_right(self.lengths, max_length)
+        out = []
+        for i in range(first, last):
+            start, end = self.offsets[i], self.offsets[i + 1]
+            run = range(
+                bisect_left(self.scores, lower, start, end),
+                bisect_left(self.scores, upper, start, end))
+            if len(run) > 0:
+                out.append(run)
+        return out
+
+    def select(
+        self,
+        min_length: int,
+        max_length: int,
+        low: float,
+        high: float
+    ) -> Selection:
+        return Selection(self, self.runs(min_length, max_length, low, high))
+
+    def count_band(
+        self,
+        min_length: int,
+        max_length: int,
+        low: float,
+        high: float
+    ) -> int:
+        return sum(
+            len(run) for run in self.runs(min_length, max_length, low, high))
+
+    def pick(
+        self,
+        min_length: int,
+        max_length: int,
+        low: float,
+        high: float,
+        rng: Optional[random.Random] = None
+    ) -> str:
+        """
+        Picks a word uniformly among the ones within the length range and
+        the percentile band. Raises `IndexError` if there is none.
+        """
+        selection = self.select(min_length, max_length, low, high)
+        if len(selection) <= 0:
+            raise IndexError("empty length range or percentile band")
+        randrange = rng.randrange if rng is not None else random.randrange
+        return selection[randrange(len(selection))]
@@ -1,11 +1,25 @@
 import json
+import os
 from argparse import ArgumentParser
-from functools import wraps
-from typing import Callable, List
+from functools import partial, wraps
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
 
-from hangman.constants import ANIMATIONS, MAX_LENGTH, MAX_LIVES, MIN_LENGTH
-from hangman.data import Configurations, Difficulty, Guess, State, WordList
-from hangman.utils import cached, get_resource_path
+from hangman.constants import (DEFAULT_ADDRESS, DEFAULT_LANG, MAX_LENGTH,
+                               MAX_LIVES, MIN_LENGTH)
+from hangman.data import (Configurations, Difficulty, Guess, LazyTier, State,
+                          WordList)
+from hangman import profiling
+from hangman.packed import (EMBEDDED_MODULE, MANIFEST, load_packed_wordlist,
+                            load_shard, read_languages)
+from hangman.render import Renderer
+from hangman.utils import cached, file_stamp, get_resource_path
+
+# input asking for a hint instead of guessing
+HINT = '?'
+
+# NOTE(andrea): shared by all the local games, so that the terminal is
+# redrawn in place across games.
+_renderer = Renderer()
 
 
 def print_error(string: str):
@@ -16,28 +30,220 @@ def print_info(string: str):
     print(f"info: {string}")
 
 
-@cached
+def _compiled_paths(source: str) -> Tuple[str, str]:
+    """
+    Returns the shard manifest and the packed file compiled from a JSON
+    wordlist: same name, without extension and with `.bin` respectively.
+    """
+    base = os.path.splitext(source)[0]
+    return os.path.join(base, MANIFEST), base + '.bin'
+
+
+def _is_fresh(compiled: str, source: str) -> bool:
+    return os.path.exists(compiled) and (
+        not os.path.exists(source) or
+        os.path.getmtime(compiled) >= os.path.getmtime(source)
+    )
+
+
+def _load_embedded(lang: str, tier: str) -> Optional[Sequence[str]]:
+    """
+    Returns the tier from the wordlists embedded in the executable,
+    or `None` if they were not generated.
+    """
+    try:
+        embedded = __import__(EMBEDDED_MODULE, fromlist=['DATA'])
+    except ImportError:
+        return None
+    words: Sequence[str] = getattr(read_languages(embedded.DATA)[lang], tier)
+    return words
+
+
+def _uses_json(source: str) -> bool:
+    """
+    Whether the tiers are parsed from the JSON file, for lack of an up
+    to date compiled copy.
+    """
+    manifest, packed = _compiled_paths(source)
+    return os.path.exists(source) and not (
+        _is_fresh(manifest, source) or _is_fresh(packed, source))
+
+
+@profiling.profiled('load_wordlist')
+def _load_tier(source: str, lang: str, tier: str) -> Sequence[str]:
+    """
+    Loads a single difficulty tier. Up to date compiled copies of the
+    JSON file are preferred: first the shard of this language and tier,
+    then the packed file. Both are memory-mapped instead of parsed.
+    Without any asset on disk, the embedded wordlists are used.
+    """
+    manifest, packed = _compiled_paths(source)
+    if not os.path.exists(source):
+        embedded = _load_embedded(lang, tier)
+        if embedded is not None:
+            return embedded
+        if not os.path.exists(manifest) and not os.path.exists(packed):
+            raise FileNotFoundError(
+                f"no wordlist found: '{source}' does not exist and the "
+                "wordlists were not embedded in the game")
+
+    if _is_fresh(manifest, source):
+        return load_shard(os.path.dirname(manifest), lang, tier)
+    if _is_fresh(packed, source):
+        packed_words: Sequence[str] = getattr(
+            load_packed_wordlist(packed, lang), tier)
+        return packed_words
+
+    # NOTE(andrea): JSON cannot be parsed partially, but we only keep
+    # the tier we were asked for and let the rest be collected.
+    with open(source, 'r') as f:
+        words: List[str] = json.load(f)[lang][tier]
+    return words
+
+
+@profiling.profiled('load_wordlist')
+def _load_tiers(source: str, lang: str) -> Dict[str, Sequence[str]]:
+    """
+    Loads every difficulty tier, for the queries that read them all.
+    The JSON file is parsed once for all of them.
+    """
+    if not _uses_json(source):
+        return {d.value: _load_tier(source, lang, d.value) for d in Difficulty}
+    with open(source, 'r') as f:
+        tiers: Dict[str, Sequence[str]] = json.load(f)[lang]
+    return {d.value: tiers[d.value] for d in Difficulty}
+
+
+def _wordlist_stamp(path: str, lang: str):
+    source = get_resource_path(path)
+    return file_stamp(source, *_compiled_paths(source))
+
+
+@cached(maxsize=8, stamp=_wordlist_stamp)
 def load_wordlist(
     path: str = './assets/wordlists.json',
-    lang: str = 'BRITISH'
+    lang: str = DEFAULT_LANG
 ) -> WordList:
-    with open(get_resource_path(path), 'r') as f:
-        data = json.load(f)[lang]
-    return WordList(**data)
+    """
+    Returns the wordlist of the given language. No file is read here:
+    each tier is loaded the first time its words are accessed.
+    A new wordlist is returned whenever the asset files change on disk.
+    """
+    source = get_resource_path(path)
+    return WordList(
+        **{
+            d.value: LazyTier(partial(_load_tier, source, lang, d.value))
+            for d in Difficulty
+        },
+        load_all=partial(_load_tiers, source, lang)
+    )
 
 
 def validate_configuration(
     config: Configurations,
-    wordlist: WordList = load_wordlist()
-):
+    wordlist: Optional[WordList] = None
+) -> int:
+    """
+    Checks that some word can be picked with the given configuration,
+    using the length histogram of the tier. Returns how many words can be.
+    """
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
 
-    target_list: List[str] = getattr(wordlist, config.difficulty.value, [])
+    if config.difficulty_range is not None:
+        return _validate_difficulty_range(
+            config, wordlist, *config.difficulty_range)
 
-    if max(len(w) for w in target_list) < config.min_length:
+    try:
+        index = wordlist.index(config.difficulty)
+    except KeyError:
+        msg = f"The language '{config.lang}' is not available."
+        print_error(msg)
+        raise ValueError(msg)
+
+    if len(index) == 0:
+        msg = f"There are no {config.difficulty.value} words in the game."
+        print_error(msg)
+        raise ValueError(msg)
+
+    if index.max_length < config.min_length:
         msg = f"The are no words as long as {config.min_length} in the game."
         print_error(msg)
         raise ValueError(msg)
 
+    available = index.count(config.min_length, config.max_length)
+    if available == 0:
+        msg = (
+            f"There are no words between {config.min_length} and "
+            f"{config.max_length} characters in the game, the "
+            f"{len(index)} {config.difficulty.value} words are between "
+            f"{index.min_length} and {index.max_length} characters long."
+        )
+        print_error(msg)
+        raise ValueError(msg)
+
+    return available
+
+
+def _validate_difficulty_range(
+    config: Configurations,
+    wordlist: WordList,
+    low: float,
+    high: float
+) -> int:
+    try:
+        index = wordlist.score_index()
+    except KeyError:
+        msg = f"The language '{config.lang}' is not available."
+        print_error(msg)
+        raise ValueError(msg)
+
+    available = index.count_band(
+        config.min_length, config.max_length, low, high)
+    if available == 0:
+        msg = (
+            f"There are no words between {config.min_length} and "
+            f"{config.max_length} characters in the {low}-{high} "
+            "difficulty range."
+        )
+        print_error(msg)
+        raise ValueError(msg)
+
+    return available
+
+
+def parse_address(address: str) -> Union[Tuple[str, int], str]:
+    """
+    Parses a server address. Returns either a `(host, port)` pair or
+    the path of a Unix socket.
+    """
+    if address.startswith('unix:'):
+        path = address[len('unix:'):]
+        if not path:
+            raise ValueError("the unix socket path is empty")
+        return path
+
+    host, sep, port = address.rpartition(':')
+    if not sep or not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"'{address}' is not a valid server address")
+    return host or '127.0.0.1', int(port)
+
+
+def parse_difficulty_range(text: str) -> Tuple[float, float]:
+    """
+    Parses a percentile band such as `0.8-0.95`.
+    """
+    low, sep, high = text.partition('-')
+    try:
+        band = float(low), float(high)
+    except ValueError:
+        band = None
+    if not sep or band is None or not 0 <= band[0] < band[1] <= 1:
+        raise ValueError(
+            f"'{text}' is not a valid difficulty range, expected two "
+            "percentiles between 0 and 1 such as 0.8-0.95")
+    return band
+
 
 def parse_args(argList: List[str]) -> Configurations:
     # specifying the argument parser
@@ -65,9 +271,85 @@ def parse_args(argList: List[str]) -> Configurations:
             "Can be: 'easy', 'medium', or 'hard'"
         )
     )
+    parser.add_argument(
+        "--difficulty-range",
+        metavar="LOW-HIGH",
+        help=(
+            "picks words by percentile of difficulty score across all " +
+            "the levels, e.g. 0.8-0.95 for the hardest words but the " +
+            "top 5%%. Overrides --difficulty"
+        )
+    )
+    parser.add_argument(
+        "--lang",
+        default=DEFAULT_LANG,
+        help=f"specifies the language of the words (default: {DEFAULT_LANG})"
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const=DEFAULT_ADDRESS,
+        metavar="ADDRESS",
+        help=(
+            "runs a headless game server instead of a local game. " +
+            "ADDRESS is either 'host:port' or 'unix:/path/to/socket' " +
+            f"(default: {DEFAULT_ADDRESS})"
+        )
+    )
+
+    parser.add_argument(
+        "--batch",
+        nargs="?",
+        const="-",
+        metavar="FILE",
+        help=(
+            "plays the games described in FILE (JSON Lines, default: " +
+            "stdin) without prompts, and prints one result per game"
+        )
+    )
+
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="timing",
+        choices=profiling.MODES,
+        help=(
+            "records the time spent in every phase of the game and " +
+            "prints a report at exit. 'cprofile' and 'tracemalloc' " +
+            "add a profile or a memory snapshot (default: timing)"
+        )
+    )
+    parser.add_argument(
+        "--journal",
+        metavar="FILE",
+        help="records every game event to the binary journal FILE"
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help=(
+            "seeds the order words are dealt in, for reproducible " +
+            "sessions. No word is repeated before all were played"
+        )
+    )
+    parser.add_argument(
+        "--record",
+        metavar="FILE",
+        help="records the outcome of every game to the stats database FILE"
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        help="prints the win rates recorded in the stats database FILE"
+    )
 
     args = parser.parse_args(argList)
 
+    # NOTE(andrea): enabled before the checks, so that loading the
+    # wordlist during validation is measured as well.
+    if args.profile is not None:
+        profiling.enable(args.profile)
+
     # sanity checks
     if args.minimum_length is not None:
         if (
@@ -104,6 +386,65 @@ def parse_args(argList: List[str]) -> Configurations:
             print_error(error_msg)
             raise ValueError(error_msg)
 
+    difficulty_range = None
+    if args.difficulty_range is not None:
+        try:
+            difficulty_range = parse_difficulty_range(args.difficulty_range)
+        except ValueError as e:
+            print_error(str(e))
+            raise
+
+    if args.serve is not None and args.batch is not None:
+        error_msg = "cannot serve games and run a batch at the same time"
+        print_error(error_msg)
+        raise ValueError(error_msg)
+
+    if args.batch is not None and args.batch != '-':
+        if not os.path.isfile(args.batch):
+            error_msg = f"the batch file '{args.batch}' does not exist"
+            print_error(error_msg)
+            raise ValueError(error_msg)
+
+    if args.stats is not None and not os.path.isfile(args.stats):
+        error_msg = f"the stats database '{args.stats}' does not exist"
+        print_error(error_msg)
+        raise ValueError(error_msg)
+
+    if args.record is not None and (
+        args.serve is not None or args.batch is not None
+    ):
+        error_msg = "only local games can be recorded"
+        print_error(error_msg)
+        raise ValueError(error_msg)
+
+    if args.journal is not None and args.batch is not None:
+        error_msg = "batch games cannot be journaled"
+        print_error(error_msg)
+        raise ValueError(error_msg)
+
+    # NOTE(andrea): the files are opened here, so that a bad path is
+    # reported before the first game instead of as a traceback.
+    if args.journal is not None:
+        try:
+            open(args.journal, 'ab').close()
+        except OSError as e:
+            error_msg = f"cannot open the journal '{args.journal}': {e}"
+            print_error(error_msg)
+            raise ValueError(error_msg)
+
+    if args.record is not None:
+        _check_database(args.record, create=True)
+
+    if args.stats is not None:
+        _check_database(args.stats, create=False)
+
+    if args.serve is not None:
+        try:
+            parse_address(args.serve)
+        except ValueError as e:
+            print_error(str(e))
+            raise
+
     difficulty_level = Difficulty[args.difficulty.upper()]
 
     # ceate config object
@@ -111,7 +452,16 @@ def parse_args(argList: List[str]) -> Configurations:
         lives=args.lives,
         min_length=args.minimum_length,
         max_length=args.maximum_length,
-        difficulty=difficulty_level
+        difficulty=difficulty_level,
+        lang=args.lang,
+        serve=args.serve,
+        batch=args.batch,
+        journal=args.journal,
+        profile=args.profile,
+        seed=args.seed,
+        difficulty_range=difficulty_range,
+        record=args.record,
+        stats=args.stats
     )
 
     validate_configuration(out)
@@ -119,6 +469,32 @@ def parse_args(argList: List[str]) -> Configurations:
     return out
 
 
+def _check_database(path: str, create: bool):
+    """
+    Opens the stats database at `path`, creating it if `create` is set.
+    Raises `ValueError` if it cannot be opened or does not hold games.
+    """
+    # NOTE(andrea): imported here so that games that are not recorded
+    # do not pay for loading sqlite3.
+    import sqlite3
+
+    from hangman.stats import connect, connect_read_only
+
+    try:
+        if create:
+            connection = connect(path)
+        else:
+            connection = connect_read_only(path)
+        try:
+            connection.execute('SELECT count(*) FROM games').fetchone()
+        finally:
+            connection.close()
+    except sqlite3.Error as e:
+        error_msg = f"'{path}' is not a usable stats database: {e}"
+        print_error(error_msg)
+        raise ValueError(error_msg)
+
+
 def prompt(f: Callable) -> Callable:
     """
     Prompts the user to input a value until either the value is legal
@@ -135,9 +511,12 @@ def prompt(f: Callable) -> Callable:
     return inner
 
 
-@prompt
-def get_guess(game_state: State) -> Guess:
-    user_input = input("Please enter your guess: ").lower()
+def parse_guess(game_state: State, user_input: str) -> Guess:
+    """
+    Turns the raw input of the player into a `Guess`.
+    Raises `ValueError` if the input is not a legal guess.
+    """
+    user_input = user_input.lower()
 
     if len(user_input) == 0:
         raise ValueError("you must guess a character or the entire word")
@@ -154,36 +533,33 @@ def get_guess(game_state: State) -> Guess:
     raise ValueError("the word to be guessed has a different length")
 
 
-def display(state: State):
-    curr_animation = MAX_LIVES - state.current_lives
-    if curr_animation >= len(ANIMATIONS):
-        # NOTE(andrea): we should use ValueError only as
-        # an indicator of failure in input parsing.
-        # In this case, if we reach such a state (and we shouldn't)
-        # our program should crash.
-        raise RuntimeError("Lives is inconsistent with animations.")
-
-    if not state.is_running:
-        if state.is_victory:
-            print('\nCongratulations, you have guessed the word!\n')
+@prompt
+def get_guess(
+    game_state: State,
+    hint: Optional[Callable[[State], Optional[str]]] = None
+) -> Guess:
+    """
+    Asks the player for a guess. If `hint` is given, entering `HINT`
+    shows the letter it suggests and asks again.
+    """
+    while True:
+        user_input = input("Please enter your guess: ")
+        if hint is None or user_input != HINT:
+            return parse_guess(game_state, user_input)
+        letter = hint(game_state)
+        if letter is None:
+            print_info("no hint is available for this word")
         else:
-            print('\nSorry, you have lost!\n')
-        print(f"Word: {' '.join(c for c in state.target_word)}")
-    else:
-        # print current word based on the list of guesses
-        current_word: List[str] = []
-        for char in state.target_word:
-            try:
-                next(g for g in state.guesses if g.guess == char)
-                current_word.append(char)
-            except StopIteration:
-                current_word.append('_')
-        print("Word: {}".format(" ".join(current_word)))
+            print_info(f"hint: try '{letter}'")
 
-    if state.current_guess is not None:
-        print("Guess: {}".format(state.current_guess.guess))
 
-    print(ANIMATIONS[curr_animation])
+@profiling.profiled('display')
+def display(state: State, renderer: Optional[Renderer] = None):
+    """
+    Draws the state with `renderer`, or with the renderer shared by the
+    local games.
+    """
+    (renderer if renderer is not None else _renderer).draw(state)
 
 
 @prompt
@@ -0,0 +1,341 @@
+"""
+Compact binary representation of the wordlists.
+
+The JSON asset stays the source of truth, this module compiles it into
+a file that can be memory-mapped and read without decoding every word.
+
+Layout (all integers are little endian):
+
+    header      magic `HMWL`, version (u16), language count (u16)
+    languages   per language: name (16 bytes, NUL padded) followed by
+                (bucket table offset, bucket count, scores offset)
+                (u32, u32, u32) per difficulty tier
+    buckets     per bucket: word length (u16), word count (u32) and
+                offset of the first word in the file (u32)
+    scores      per tier: the difficulty score of every word (f32), in
+                the order of the words
+    words       the words of each bucket, ASCII encoded and packed
+                back to back without separators
+
+Since all words in a bucket have the same length, the i-th word of a
+bucket is found at `offset + i * length`. Version 1 files, without the
+scores, can still be read.
+
+The wordlists can also be split into one packed file per language and
+tier (a shard), listed in a `manifest.json`:
+
+    {"version": 1, "languages": {"BRITISH": {"easy": {"path":
+     "BRITISH/easy.bin", "count": 9972}, ...}}}
+
+so that a game only opens the shard it plays with.
+
+For the frozen executable, the packed bytes of every language can be
+embedded in a generated Python module (`hangman/_wordlists_data.py`),
+which is bundled as bytecode: no file is extracted nor parsed at startup.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+from argparse import ArgumentParser
+from array import array
+from bisect import bisect_right
+from typing import (Any, Dict, List, Optional, Sequence, Tuple, Union,
+                    overload)
+
+from hangman.data import Difficulty, WordList
+from hangman.index import LengthIndex, word_score
+
+MAGIC = b'HMWL'
+VERSION = 2
+MANIFEST = 'manifest.json'
+MANIFEST_VERSION = 1
+
+_HEADER = struct.Struct('<4sHH')
+_LANG_NAME = struct.Struct('<16s')
+_TIER = struct.Struct('<III')
+_TIER_V1 = struct.Struct('<II')
+_BUCKET = struct.Struct('<HII')
+_SCORE = struct.Struct('<f')
+
+Buffer = Union[bytes, mmap.mmap, memoryview]
+
+
+class PackedTier(Sequence[str]):
+    """
+    Read-only view over a packed difficulty tier. Words are sorted by
+    length and decoded only when accessed.
+    """
+
+    __slots__ = ('_buffer', 'lengths', 'offsets', '_starts', '_scores')
+
+    def __init__(
+        self,
+        buffer: Buffer,
+        buckets: List[Tuple[int, int, int]],
+        scores: Optional[int] = None
+    ):
+        self._buffer = buffer
+        self._scores = scores
+        self.lengths: List[int] = []
+        self.offsets: List[int] = [0]
+        self._starts: List[int] = []
+        for length, count, start in buckets:
+            self.lengths.append(length)
+            self.offsets.append(self.offsets[-1] + count)
+            self._starts.append(start)
+
+    def __len__(self) -> int:
+        return self.offsets[-1]
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+
+    @overload
+    def __getitem__(self, i: slice) -> List[str]: ...
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("packed tier index out of range")
+        bucket = bisect_right(self.offsets, i) - 1
+        length = self.lengths[bucket]
+        start = self._starts[bucket] + (i - self.offsets[bucket]) * length
+        return bytes(self._buffer[start:start + length]).decode('ascii')
+
+    def length_index(self) -> LengthIndex:
+        """
+        The words are already grouped by length on disk, so the index
+        shares the bucket tables instead of sorting the tier again.
+        """
+        return LengthIndex.from_buckets(self, self.lengths, self.offsets)
+
+    def scores(self) -> Optional[Sequence[float]]:
+        """
+        Returns the stored difficulty scores of the words, or `None` for
+        files without scores.
+        """
+        if self._scores is None:
+            return None
+        scores = array('f')
+        end = self._scores + len(self) * _SCORE.size
+        scores.frombytes(self._buffer[self._scores:end])
+        if sys.byteorder == 'big':
+            scores.byteswap()
+        return scores
+
+
+def pack_wordlists(wordlists: Dict[str, WordList]) -> bytes:
+    """
+    Serializes the given languages into the packed binary format.
+    """
+    tiers = [d.value for d in Difficulty]
+    header_size = (
+        _HEADER.size +
+        len(wordlists) * (_LANG_NAME.size + len(tiers) * _TIER.size)
+    )
+
+    # NOTE(andrea): the bucket tables are laid out first, so we need
+    # their total size before we can compute any word offset.
+    grouped: List[List[List[Tuple[int, List[bytes]]]]] = []
+    for wordlist in wordlists.values():
+        lang_buckets = []
+        for tier in tiers:
+            by_length: Dict[int, List[bytes]] = {}
+            for word in getattr(wordlist, tier):
+                try:
+                    encoded = word.encode('ascii')
+                except UnicodeEncodeError:
+                    raise ValueError(f"'{word}' is not an ASCII word")
+                by_length.setdefault(len(encoded), []).append(encoded)
+            lang_buckets.append(sorted(by_length.items()))
+        grouped.append(lang_buckets)
+
+    n_buckets = sum(len(b) for lang in grouped for b in lang)
+    n_words = sum(
+        len(words) for lang in grouped for b in lang for _, words in b)
+    tables_size = n_buckets * _BUCKET.size
+    scores_size = n_words * _SCORE.size
+
+    head = bytearray(_HEADER.pack(MAGIC, VERSION, len(wordlists)))
+    tables = bytearray()
+    scores = array('f')
+    blob = bytearray()
+    for lang, lang_buckets in zip(wordlists, grouped):
+        name = lang.encode('ascii')
+        if len(name) > _LANG_NAME.size:
+            raise ValueError(f"language name '{lang}' is too long")
+        head += _LANG_NAME.pack(name)
+        for buckets in lang_buckets:
+            head += _TIER.pack(
+                header_size + len(tables),
+                len(buckets),
+                header_size + tables_size + len(scores) * _SCORE.size)
+            for length, words in buckets:
+                start = header_size + tables_size + scores_size + len(blob)
+                tables += _BUCKET.pack(length, len(words), start)
+                scores.extend(word_score(w.decode('ascii')) for w in words)
+                blob += b''.join(words)
+
+    if sys.byteorder == 'big':
+        scores.byteswap()
+    return bytes(head + tables + scores.tobytes() + blob)
+
+
+def read_languages(buffer: Buffer) -> Dict[str, WordList]:
+    """
+    Decodes the header of a packed buffer and returns a lazy `WordList`
+    for each language it contains.
+    """
+    magic, version, n_langs = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("not a packed wordlist file")
+    if version not in (1, VERSION):
+        raise ValueError(f"unsupported packed wordlist version {version}")
+    tier_entry = _TIER if version == VERSION else _TIER_V1
+
+    out: Dict[str, WordList] = {}
+    pos = _HEADER.size
+    for _ in range(n_langs):
+        name, = _LANG_NAME.unpack_from(buffer, pos)
+        pos += _LANG_NAME.size
+        tiers = {}
+        for difficulty in Difficulty:
+            table, n_buckets, *scores = tier_entry.unpack_from(buffer, pos)
+            pos += tier_entry.size
+            buckets = [
+                _BUCKET.unpack_from(buffer, table + i * _BUCKET.size)
+                for i in range(n_buckets)
+            ]
+            tiers[difficulty.value] = PackedTier(
+                buffer, buckets, scores[0] if scores else None)
+        out[name.rstrip(b'\0').decode('ascii')] = WordList(
+            easy=tiers['easy'], medium=tiers['medium'], hard=tiers['hard'])
+    return out
+
+
+def _map(path: str) -> mmap.mmap:
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def load_packed_wordlist(path: str, lang: str = 'BRITISH') -> WordList:
+    """
+    Memory-maps a packed wordlist file. The mapping stays open for as
+    long as the returned `WordList` is referenced.
+    """
+    return read_languages(_map(path))[lang]
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST), 'r') as f:
+        manifest: Dict[str, Any] = json.load(f)
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError("unsupported wordlist manifest version")
+    return manifest
+
+
+def load_shard(directory: str, lang: str, tier: str) -> PackedTier:
+    """
+    Memory-maps the shard of a single language and tier.
+    Raises `KeyError` if the manifest does not list it.
+    """
+    entry = read_manifest(directory)['languages'][lang][tier]
+    buffer = _map(os.path.join(directory, entry['path']))
+    words: PackedTier = getattr(read_languages(buffer)[lang], tier)
+    return words
+
+
+def write_shards(wordlists: Dict[str, WordList], directory: str):
+    """
+    Writes one packed file per language and tier, and the manifest
+    listing them. The manifest is written last, so that its
+    modification time tells when the shards were built.
+    """
+    tiers = [d.value for d in Difficulty]
+    languages: Dict[str, Dict[str, Any]] = {}
+    for lang, wordlist in wordlists.items():
+        os.makedirs(os.path.join(directory, lang), exist_ok=True)
+        languages[lang] = {}
+        for tier in tiers:
+            words = getattr(wordlist, tier)
+            shard = WordList(**{
+                t: words if t == tier else [] for t in tiers})
+            path = f"{lang}/{tier}.bin"
+            with open(os.path.join(directory, path), 'wb') as f:
+                f.write(pack_wordlists({lang: shard}))
+            languages[lang][tier] = {'path': path, 'count': len(words)}
+
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump(
+            {'version': MANIFEST_VERSION, 'languages': languages}, f,
+            indent=2)
+
+
+EMBEDDED_MODULE = 'hangman._wordlists_data'
+
+# bytes per line of the generated module, short enough for flake8
+_EMBED_LINE = 16
+
+
+def write_embedded(wordlists: Dict[str, WordList], path: str):
+    """
+    Writes a Python module holding the packed wordlists in `DATA`.
+    """
+    data = pack_wordlists(wordlists)
+    with open(path, 'w') as f:
+        f.write("# Generated by `python -m hangman.packed --embed`, "
+                "do not edit.\n")
+        f.write("DATA = (\n")
+        for i in range(0, len(data), _EMBED_LINE):
+            f.write(f"    {data[i:i + _EMBED_LINE]!r}\n")
+        f.write(")\n")
+
+
+def compile_wordlists(
+    src: str,
+    dst: str,
+    split: bool = False,
+    embed: bool = False
+):
+    with open(src, 'r') as f:
+        data = json.load(f)
+    wordlists = {lang: WordList(**tiers) for lang, tiers in data.items()}
+    if split:
+        write_shards(wordlists, dst)
+        return
+    if embed:
+        write_embedded(wordlists, dst)
+        return
+    with open(dst, 'wb') as f:
+        f.write(pack_wordlists(wordlists))
+
+
+def main(argList: List[str]):
+    parser = ArgumentParser(
+        description="compiles a JSON wordlist into the packed format")
+    parser.add_argument("source", help="path of the JSON wordlist")
+    parser.add_argument(
+        "destination",
+        help="path of the packed file, of the directory with --split, "
+             "or of the Python module with --embed")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument(
+        "--split",
+        action="store_true",
+        help="writes one file per language and tier, plus a manifest")
+    output.add_argument(
+        "--embed",
+        action="store_true",
+        help="writes a Python module embedding the packed wordlists")
+    args = parser.parse_args(argList)
+    compile_wordlists(
+        args.source, args.destination, args.split, args.embed)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
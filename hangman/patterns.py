@@ -0,0 +1,233 @@
+"""
+Positional bitset index over the words of a tier, for pattern queries
+such as "7 letters, 'a' at position 2, no 'e' anywhere".
+
+The words of every length are numbered, and for each (position, letter)
+pair the index keeps the set of words having that letter there, as the
+bits of a Python int. Another bitset per letter tells which words contain
+it anywhere. A query is then a few AND / AND NOT of those bitsets.
+
+Queries mirror what a `State` shows: a pattern like `state.revealed`,
+with `_` for the hidden positions, and the letters guessed but missed.
+As guessing a letter reveals all of its occurrences, revealed letters
+cannot appear at the hidden positions either.
+
+`best_letter` suggests letters like `hangman.solver`, for the builds
+without numpy.
+"""
+import random
+from string import ascii_lowercase
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from hangman.data import State
+from hangman.index import LengthIndex
+
+HIDDEN = '_'
+
+# NOTE(andrea): int.bit_count is only available from Python 3.10
+_popcount = getattr(int, 'bit_count', lambda x: bin(x).count('1'))
+
+
+class _Bucket:
+    """
+    Bitsets of the words of a single length.
+    """
+
+    __slots__ = ('start', 'size', 'positions', 'letters')
+
+    def __init__(
+        self,
+        words: Sequence[str],
+        start: int,
+        size: int,
+        length: int
+    ):
+        self.start = start
+        self.size = size
+        # NOTE(andrea): bit positions are collected first and every
+        # bitset is built at once, growing ints bit by bit is quadratic.
+        found: List[Dict[str, List[int]]] = [{} for _ in range(length)]
+        for k in range(size):
+            for i, c in enumerate(words[start + k]):
+                found[i].setdefault(c, []).append(k)
+
+        self.positions: List[Dict[str, int]] = [
+            {c: _bitset(bits, size) for c, bits in column.items()}
+            for column in found
+        ]
+        self.letters: Dict[str, int] = {}
+        for column in self.positions:
+            for c, bits in column.items():
+                self.letters[c] = self.letters.get(c, 0) | bits
+
+
+def _bitset(bits: List[int], size: int) -> int:
+    buffer = bytearray((size + 7) // 8)
+    for k in bits:
+        buffer[k >> 3] |= 1 << (k & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def missed_letters(state: State) -> List[str]:
+    """
+    Returns the letters guessed in the game that are not in the word.
+    """
+    shown = set(state.revealed)
+    return [
+        g.guess for g in state.guesses
+        if not g.whole_word and g.guess not in shown
+    ]
+
+
+class PatternIndex:
+    """
+    Pattern queries over the words of a tier. The bitsets of a word
+    length are built the first time it is queried.
+    """
+
+    __slots__ = ('index', '_buckets')
+
+    def __init__(self, index: LengthIndex):
+        self.index = index
+        self._buckets: Dict[int, _Bucket] = {}
+
+    def _bucket(self, length: int) -> _Bucket:
+        try:
+            return self._buckets[length]
+        except KeyError:
+            pass
+        span = self.index.span(length, length)
+        bucket = _Bucket(self.index.words, span.start, len(span), length)
+        self._buckets[length] = bucket
+        return bucket
+
+    def prepare(self, length: int):
+        """
+        Builds the bitsets of the words of the given length now instead
+        of on the first query.
+        """
+        self._bucket(length)
+
+    def matches(
+        self,
+        pattern: Sequence[str],
+        missed: Iterable[str] = ()
+    ) -> int:
+        """
+        Returns the bitset of the words of length `len(pattern)` that
+        match the pattern and contain none of the `missed` letters.
+        """
+        bucket = self._bucket(len(pattern))
+        mask = (1 << bucket.size) - 1
+        shown = set()
+        hidden = []
+        for i, c in enumerate(pattern):
+            if c == HIDDEN:
+                hidden.append(i)
+            else:
+                mask &= bucket.positions[i].get(c, 0)
+                shown.add(c)
+            if not mask:
+                return 0
+
+        for c in missed:
+            mask &= ~bucket.letters.get(c, 0)
+        for i in hidden:
+            column = bucket.positions[i]
+            for c in shown:
+                mask &= ~column.get(c, 0)
+        return mask
+
+    def count(self, pattern: Sequence[str], missed: Iterable[str] = ()) -> int:
+        return _popcount(self.matches(pattern, missed))
+
+    def words(self, length: int, mask: int) -> Iterator[str]:
+        """
+        Yields the words of a bitset returned by `matches`.
+        """
+        bucket = self._bucket(length)
+        words = self.index.words
+        while mask:
+            low = mask & -mask
+            yield words[bucket.start + low.bit_length() - 1]
+            mask ^= low
+
+    def letter_counts(self, length: int, mask: int) -> Dict[str, int]:
+        """
+        Returns, for every letter, how many words of the bitset contain
+        it at least once.
+        """
+        bucket = self._bucket(length)
+        counts = {}
+        for c, bits in bucket.letters.items():
+            n = _popcount(mask & bits)
+            if n:
+                counts[c] = n
+        return counts
+
+    def letter_frequencies(self, length: int, mask: int) -> Dict[str, int]:
+        """
+        Returns, for every letter, how many times it occurs in the words
+        of the bitset.
+        """
+        bucket = self._bucket(length)
+        counts: Dict[str, int] = {}
+        for column in bucket.positions:
+            for c, bits in column.items():
+                n = _popcount(mask & bits)
+                if n:
+                    counts[c] = counts.get(c, 0) + n
+        return counts
+
+    def pick(
+        self,
+        pattern: Sequence[str],
+        missed: Iterable[str] = (),
+        rng: Optional[random.Random] = None
+    ) -> str:
+        """
+        Picks a word uniformly among the matching ones. Raises
+        `IndexError` if there is none.
+        """
+        mask = self.matches(pattern, missed)
+        n = _popcount(mask)
+        if n == 0:
+            raise IndexError("no word matches the pattern")
+        randrange = rng.randrange if rng is not None else random.randrange
+        k = randrange(n)
+        # NOTE(andrea): bisect on the bit position of the k-th set bit
+        lo, hi = 0, mask.bit_length()
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _popcount(mask & ((1 << mid) - 1)) > k:
+                hi = mid
+            else:
+                lo = mid
+        return self.index.words[self._bucket(len(pattern)).start + lo]
+
+    def state_matches(self, state: State) -> int:
+        """
+        Returns the bitset of the words of the tier consistent with what
+        the state reveals. Wrong whole-word guesses are not excluded.
+        """
+        return self.matches(state.revealed, missed_letters(state))
+
+    def best_letter(self, state: State) -> Optional[str]:
+        """
+        Suggests the unguessed lowercase letter contained in the most
+        words consistent with the state, the most frequent one on ties.
+        Returns `None` if no candidate contains any.
+        """
+        length = len(state.target_word)
+        mask = self.state_matches(state)
+        for word in state.words:
+            if len(word) == length:
+                mask &= ~self.matches(word)
+        presence = self.letter_counts(length, mask)
+        frequency = self.letter_frequencies(length, mask)
+        letters = [
+            c for c in ascii_lowercase
+            if c in presence and c not in state.history]
+        if not letters:
+            return None
+        return max(letters, key=lambda c: (presence[c], frequency[c]))
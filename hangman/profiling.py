@@ -0,0 +1,216 @@
+"""
+Lightweight profiling of the game phases (loading the wordlist, picking
+a word, updating the game, displaying it, whole turns).
+
+Instrumented functions are wrapped with `profiled`; while profiling is
+disabled the wrapper only checks a flag before calling the function.
+When enabled, the wall and CPU time of every call are recorded in a
+per-phase latency histogram and passed to the registered hooks.
+Optionally, `cProfile` and `tracemalloc` can be run alongside.
+"""
+import io
+import math
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+Hook = Callable[[str, float, float], None]
+
+MODES = ('timing', 'cprofile', 'tracemalloc')
+
+# NOTE(andrea): 8 buckets per power of two, i.e. percentiles are
+# reported within ~9% of their real value.
+_BUCKETS_PER_OCTAVE = 8
+
+_enabled = False
+_hooks: List[Hook] = []
+_phases: Dict[str, 'Histogram'] = {}
+# NOTE(andrea): cProfile, pstats and tracemalloc are only imported when
+# needed, to keep them off the startup path.
+_profiler: Optional[Any] = None
+_tracing = False
+
+
+class Histogram:
+    """
+    Log-bucketed latency histogram, with constant memory.
+    """
+
+    __slots__ = ('count', 'wall', 'cpu', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.buckets: Dict[int, int] = {}
+
+    def add(self, wall: float, cpu: float):
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        bucket = math.floor(
+            math.log2(max(wall, 1e-9) * 1e9) * _BUCKETS_PER_OCTAVE)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns the upper bound, in seconds, of the bucket holding the
+        `p`-th percentile (0 < p <= 1).
+        """
+        if self.count == 0:
+            return 0.0
+        rank = math.ceil(p * self.count)
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return 2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE) / 1e9
+        return 0.0
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable(mode: str = 'timing'):
+    """
+    Starts recording. `mode` is one of `MODES`: `cprofile` and
+    `tracemalloc` record timings as well.
+    """
+    global _enabled, _profiler, _tracing
+    if mode not in MODES:
+        raise ValueError(f"unknown profiling mode '{mode}'")
+    _enabled = True
+    if mode == 'cprofile':
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    elif mode == 'tracemalloc':
+        import tracemalloc
+        tracemalloc.start()
+        _tracing = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    if _profiler is not None:
+        _profiler.disable()
+
+
+def reset():
+    global _profiler, _tracing
+    disable()
+    _phases.clear()
+    _profiler = None
+    if _tracing:
+        import tracemalloc
+        tracemalloc.stop()
+        _tracing = False
+
+
+def add_hook(hook: Hook):
+    """
+    Registers a function called with the phase name, the wall time and
+    the CPU time (in seconds) of every recorded call.
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Hook):
+    _hooks.remove(hook)
+
+
+def record(name: str, wall: float, cpu: float):
+    histogram = _phases.get(name)
+    if histogram is None:
+        histogram = _phases[name] = Histogram()
+    histogram.add(wall, cpu)
+    for hook in _hooks:
+        hook(name, wall, cpu)
+
+
+def phases() -> Dict[str, Histogram]:
+    return dict(_phases)
+
+
+def profiled(name: str) -> Callable[[Callable], Callable]:
+    """
+    Records every call of the decorated function as the phase `name`.
+    """
+    def decorator(f: Callable) -> Callable:
+        @wraps(f)
+        def inner(*args, **kwargs):
+            if not _enabled:
+                return f(*args, **kwargs)
+            wall, cpu = time.perf_counter(), time.process_time()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                record(
+                    name,
+                    time.perf_counter() - wall,
+                    time.process_time() - cpu)
+        return inner
+    return decorator
+
+
+@contextmanager
+def _timed(name: str) -> Iterator[None]:
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - wall, time.process_time() - cpu)
+
+
+class _Nothing:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOTHING = _Nothing()
+
+
+def phase(name: str):
+    """
+    Context manager recording the enclosed block as the phase `name`.
+    """
+    return _timed(name) if _enabled else _NOTHING
+
+
+def report() -> str:
+    lines = [
+        f"{'phase':<16} {'calls':>8} {'wall (s)':>10} {'cpu (s)':>10} "
+        f"{'p50 (ms)':>9} {'p95 (ms)':>9} {'p99 (ms)':>9}"
+    ]
+    for name, h in sorted(_phases.items()):
+        lines.append(
+            f"{name:<16} {h.count:>8} {h.wall:>10.4f} {h.cpu:>10.4f} "
+            f"{h.percentile(0.50) * 1e3:>9.3f} "
+            f"{h.percentile(0.95) * 1e3:>9.3f} "
+            f"{h.percentile(0.99) * 1e3:>9.3f}"
+        )
+
+    if _profiler is not None:
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(_profiler, stream=out) \
+            .sort_stats('cumulative').print_stats(20)
+        lines.append(out.getvalue())
+
+    if _tracing:
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        lines.append(
+            f"\nmemory: {current / 1024:.1f} KiB current, "
+            f"{peak / 1024:.1f} KiB peak")
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics('lineno')[:10]:
+            lines.append(str(stat))
+
+    return "\n".join(lines)
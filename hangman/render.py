@@ -0,0 +1,152 @@
+"""
+Renders the game screen. Every update is composed in a single buffer
+and written at once.
+
+On ANSI terminals the screen is redrawn in place: the first update
+clears the terminal and draws the screen at its top, later updates only
+rewrite the lines that changed and clear whatever was printed below the
+screen since (prompts, answers and messages). Elsewhere (pipes, files,
+dumb terminals) every update is appended to the output as plain text.
+"""
+import os
+import shutil
+import sys
+from typing import List, Optional, TextIO
+
+from hangman.constants import ANIMATIONS, MAX_LIVES
+from hangman.data import State
+
+_CLEAR_SCREEN = '\x1b[H\x1b[2J'
+_CLEAR_LINE = '\x1b[K'
+_CLEAR_BELOW = '\x1b[J'
+
+# lines left free below the screen for the prompts
+_PROMPT_ROWS = 3
+
+
+def _move_to(row: int) -> str:
+    return f'\x1b[{row};1H'
+
+
+def supports_ansi(out: TextIO) -> bool:
+    isatty = getattr(out, 'isatty', None)
+    if isatty is None or not isatty():
+        return False
+    if os.environ.get('TERM') == 'dumb':
+        return False
+    # NOTE(andrea): the legacy Windows console does not interpret escape
+    # sequences, Windows Terminal does.
+    return os.name != 'nt' or 'WT_SESSION' in os.environ
+
+
+class Renderer:
+    """
+    Draws game states to `out` (the current `sys.stdout` by default).
+    `ansi` forces the in-place redraw on or off, by default it is used
+    whenever the output is a terminal that supports it.
+    """
+
+    __slots__ = ('out', 'ansi', '_frames', '_frame_lines', '_screen')
+
+    def __init__(
+        self,
+        out: Optional[TextIO] = None,
+        ansi: Optional[bool] = None
+    ):
+        self.out = out
+        self.ansi = ansi
+        self._frames = [frame + '\n' for frame in ANIMATIONS]
+        self._frame_lines = [frame.split('\n') for frame in ANIMATIONS]
+        # lines currently on the terminal, when redrawing in place
+        self._screen: Optional[List[str]] = None
+
+    def _head(self, state: State) -> List[str]:
+        lines = []
+        if not state.is_running:
+            if state.is_victory:
+                message = 'Congratulations, you have guessed the word!'
+            else:
+                message = 'Sorry, you have lost!'
+            lines += ['', message, '']
+            lines.append(f"Word: {' '.join(state.target_word)}")
+        else:
+            lines.append(f"Word: {' '.join(state.revealed)}")
+        if state.current_guess is not None:
+            lines.append(f"Guess: {state.current_guess.guess}")
+        return lines
+
+    def _frame(self, state: State) -> int:
+        frame = MAX_LIVES - state.current_lives
+        if frame >= len(ANIMATIONS):
+            # NOTE(andrea): we should use ValueError only as
+            # an indicator of failure in input parsing.
+            # In this case, if we reach such a state (and we shouldn't)
+            # our program should crash.
+            raise RuntimeError("Lives is inconsistent with animations.")
+        return frame
+
+    def render(self, state: State) -> str:
+        """
+        Returns the screen of the state as plain text.
+        """
+        frame = self._frame(state)
+        return '\n'.join(self._head(state)) + '\n' + self._frames[frame]
+
+    def draw(self, state: State):
+        out = self.out if self.out is not None else sys.stdout
+        ansi = self.ansi if self.ansi is not None else supports_ansi(out)
+        if not ansi:
+            out.write(self.render(state))
+            out.flush()
+            return
+
+        frame = self._frame(state)
+        lines = self._head(state) + self._frame_lines[frame]
+        update = self._redraw(lines)
+        if update:
+            out.write(update)
+            out.flush()
+
+    def reset(self):
+        """
+        Forgets what is on the terminal, the next update redraws it all.
+        """
+        self._screen = None
+
+    def _redraw(self, lines: List[str]) -> str:
+        """
+        Returns the escape sequences and text turning the screen on the
+        terminal into `lines`, empty if they are already there.
+        """
+        size = shutil.get_terminal_size()
+
+        def rows(line: str) -> int:
+            return max(1, -(-len(line) // size.columns))
+
+        screen = self._screen
+        self._screen = lines
+        if screen == lines:
+            return ''
+
+        total = sum(rows(line) for line in lines)
+        if total + _PROMPT_ROWS > size.lines:
+            # NOTE(andrea): the screen does not fit the terminal, so its
+            # rows cannot be addressed; draw it all every time.
+            self._screen = None
+            return _CLEAR_SCREEN + '\n'.join(lines) + '\n'
+        if screen is None:
+            return _CLEAR_SCREEN + '\n'.join(lines) + '\n'
+
+        parts = []
+        row = 1
+        for i, line in enumerate(lines):
+            old = screen[i] if i < len(screen) else None
+            if old is not None and rows(old) != rows(line):
+                # the layout changes from here on: rewrite the rest
+                parts += [_move_to(row), _CLEAR_BELOW, '\n'.join(lines[i:])]
+                break
+            if old != line:
+                parts += [_move_to(row), line, _CLEAR_LINE]
+            row += rows(line)
+        parts += [_move_to(total + 1), _CLEAR_BELOW]
+        return ''.join(parts)
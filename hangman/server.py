@@ -0,0 +1,196 @@
+"""
+Headless game server. Every connection plays its own games over a
+line-based protocol, and all sessions share a single `WordList`.
+
+The client sends one command per line, commands are case-insensitive:
+
+    GUESS <guess>   guesses a character or the whole word
+    NEW             starts a new game once the current one is over
+    QUIT            closes the connection
+
+Guesses are always sent with `GUESS`, so that words such as "new" or
+"quit" can be guessed as well.
+
+The server answers with one line per command:
+
+    NEW <length> <lives>        a game has started
+    STATE <word> <lives>        the game goes on, `_` marks hidden chars
+    WON <word> <lives>          the word has been guessed
+    LOST <word> <lives>         no lives are left
+    ERROR <message>             the command was not accepted
+"""
+import asyncio
+import signal
+from typing import Optional
+
+from hangman.core import init_state, make_dealer, update_game
+from hangman.data import Configurations, State, WordList
+from hangman.dealer import WordDealer
+from hangman.io import load_wordlist, parse_address, parse_guess, print_info
+from hangman.journal import Journal
+
+
+def _status(state: State) -> str:
+    if state.is_running:
+        return f"STATE {''.join(state.revealed)} {state.current_lives}"
+    outcome = "WON" if state.is_victory else "LOST"
+    return f"{outcome} {state.target_word} {state.current_lives}"
+
+
+class Session:
+    """
+    The game played on a single connection.
+    """
+
+    __slots__ = ('config', 'wordlist', 'journal', 'dealer', 'state', 'game')
+
+    def __init__(
+        self,
+        config: Configurations,
+        wordlist: WordList,
+        journal: Optional[Journal] = None,
+        dealer: Optional[WordDealer] = None
+    ):
+        self.config = config
+        self.wordlist = wordlist
+        self.journal = journal
+        self.dealer = dealer
+        self._new_game()
+
+    def _new_game(self):
+        self.state = init_state(
+            self.config, self.wordlist, dealer=self.dealer)
+        if self.journal is not None:
+            self.game = self.journal.start(self.state)
+
+    def greeting(self) -> str:
+        return f"NEW {len(self.state.target_word)} {self.state.current_lives}"
+
+    def handle(self, line: str) -> str:
+        """
+        Applies a single command and returns the reply line.
+        """
+        command, _, argument = line.strip().partition(' ')
+        command = command.upper()
+
+        if command == 'NEW' and not argument:
+            if self.state.is_running:
+                return "ERROR the current game is not over"
+            self._new_game()
+            return self.greeting()
+
+        if command != 'GUESS':
+            return "ERROR unknown command, send GUESS, NEW or QUIT"
+
+        if not self.state.is_running:
+            return "ERROR the game is over, send NEW or QUIT"
+
+        try:
+            guess = parse_guess(self.state, argument)
+        except ValueError as e:
+            return f"ERROR {e}"
+
+        # NOTE(andrea): update_game reports duplicates on the console,
+        # which is the server's one, so we catch them before.
+        if self.state.has_guessed(guess):
+            return "ERROR you already input this"
+
+        update_game(self.state, guess)
+        if self.journal is not None:
+            self.journal.guess(self.game, self.state, guess)
+            if not self.state.is_running:
+                self.journal.end(self.game, self.state)
+        return _status(self.state)
+
+
+async def _serve_connection(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    config: Configurations,
+    wordlist: WordList,
+    journal: Optional[Journal],
+    dealer: WordDealer
+):
+    session = Session(config, wordlist, journal, dealer)
+    writer.write(f"{session.greeting()}\n".encode())
+    try:
+        while True:
+            try:
+                raw = await reader.readline()
+            except (asyncio.LimitOverrunError, ValueError):
+                writer.write(b"ERROR line too long\n")
+                break
+            if not raw:
+                break
+            line = raw.decode('utf-8', errors='replace')
+            if line.strip().upper() == 'QUIT':
+                break
+            writer.write(f"{session.handle(line)}\n".encode())
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def start_server(
+    config: Configurations,
+    wordlist: Optional[WordList] = None,
+    journal: Optional[Journal] = None
+) -> asyncio.AbstractServer:
+    """
+    Starts listening on `config.serve` and returns the server.
+    Games are recorded to `journal`, if given.
+    """
+    if wordlist is None:
+        wordlist = load_wordlist(lang=config.lang)
+    shared: WordList = wordlist
+    # NOTE(andrea): build the tier index up front, so the first
+    # player does not pay for it. Words are dealt from a single
+    # dealer, so they are not repeated across connections either.
+    dealer = make_dealer(config, shared)
+
+    def on_connect(reader, writer):
+        return _serve_connection(
+            reader, writer, config, shared, journal, dealer)
+
+    address = parse_address(config.serve or '')
+    if isinstance(address, str):
+        return await asyncio.start_unix_server(on_connect, path=address)
+    host, port = address
+    return await asyncio.start_server(on_connect, host, port)
+
+
+async def _run(config: Configurations, journal: Optional[Journal]):
+    server = await start_server(config, journal=journal)
+    print_info(f"serving games on {config.serve}")
+    # NOTE(andrea): hosts stop servers with SIGTERM, which would kill
+    # the process before the journal is closed.
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        # not supported on Windows
+        pass
+    # NOTE(andrea): the connections left are cancelled by asyncio.run,
+    # waiting for them to close could take forever.
+    try:
+        await stop.wait()
+    finally:
+        server.close()
+
+
+def run_server(config: Configurations):
+    """
+    Serves games until interrupted or terminated (SIGTERM). The journal
+    is closed either way.
+    """
+    journal = Journal(config.journal) if config.journal else None
+    try:
+        asyncio.run(_run(config, journal))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if journal is not None:
+            journal.close()
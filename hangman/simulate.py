@@ -0,0 +1,292 @@
+"""
+Self-play simulation. Plays many games with an automated guessing
+strategy, spread over all cores, and reports win rate, average number
+of guesses and throughput per difficulty and word length band.
+
+    python -m hangman.simulate -n 100000 -s frequency
+
+The `solver` strategy plays with `hangman.solver` and needs numpy.
+"""
+import os
+import random
+import sys
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from string import ascii_lowercase
+from typing import Callable, Dict, List, Optional, Tuple
+
+from hangman.constants import MAX_LENGTH, MAX_LIVES, MIN_LENGTH
+from hangman.core import init_state, make_dealer, make_index, update_game
+from hangman.data import Configurations, Difficulty, Guess, State
+from hangman.dealer import WordDealer
+from hangman.io import load_wordlist
+
+# NOTE(andrea): most common letters in English words, most common first.
+FREQUENCY_ORDER = "esiarntolcdugpmhbyfvkwzxqj"
+
+# upper bounds (inclusive) of the word length bands of the report
+LENGTH_BANDS: Tuple[int, ...] = (4, 7, 10, MAX_LENGTH)
+
+Strategy = Callable[[State, random.Random], Guess]
+
+_LETTERS = [Guess(c) for c in ascii_lowercase]
+_BY_FREQUENCY = [Guess(c) for c in FREQUENCY_ORDER]
+
+
+def random_strategy(state: State, rng: random.Random) -> Guess:
+    """
+    Guesses a random character that was not guessed before.
+    """
+    return rng.choice([g for g in _LETTERS if not state.has_guessed(g)])
+
+
+def frequency_strategy(state: State, rng: random.Random) -> Guess:
+    """
+    Guesses characters from the most to the least common in English.
+    """
+    for guess in _BY_FREQUENCY:
+        if not state.has_guessed(guess):
+            return guess
+    raise RuntimeError("no characters left to guess")
+
+
+def solver_strategy(config: Configurations) -> Strategy:
+    """
+    Returns a strategy guessing the character that covers the most words
+    of the tier still consistent with the game, see `hangman.solver`.
+    Falls back to `frequency_strategy` when no word is left, e.g. for
+    target words with characters that cannot be guessed.
+    """
+    # NOTE(andrea): imported here, so that the other strategies do not
+    # need numpy.
+    from hangman.solver import Solver
+    solver = Solver(make_index(config))
+
+    def strategy(state: State, rng: random.Random) -> Guess:
+        letter = solver.best_letter(state)
+        if letter is None:
+            return frequency_strategy(state, rng)
+        return Guess(letter)
+    return strategy
+
+
+STRATEGIES: Dict[str, Strategy] = {
+    'random': random_strategy,
+    'frequency': frequency_strategy,
+}
+
+# strategies that are built for the tier being played
+STRATEGY_FACTORIES: Dict[str, Callable[[Configurations], Strategy]] = {
+    'solver': solver_strategy,
+}
+
+
+def make_strategy(name: str, config: Configurations) -> Strategy:
+    """
+    Returns the strategy called `name` for games of the configuration.
+    Raises `ValueError` if there is no such strategy.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+    if name in STRATEGY_FACTORIES:
+        return STRATEGY_FACTORIES[name](config)
+    raise ValueError(f"unknown strategy '{name}'")
+
+
+@dataclass
+class Outcome:
+    """
+    Aggregated results of the games played in a given length band.
+    """
+    games: int = 0
+    wins: int = 0
+    guesses: int = 0
+    seconds: float = 0.0
+
+    def merge(self, other: 'Outcome'):
+        self.games += other.games
+        self.wins += other.wins
+        self.guesses += other.guesses
+        self.seconds += other.seconds
+
+
+def length_band(length: int) -> int:
+    """
+    Returns the upper bound of the band the given length falls in.
+    """
+    for bound in LENGTH_BANDS:
+        if length <= bound:
+            return bound
+    return LENGTH_BANDS[-1]
+
+
+def play(
+    config: Configurations,
+    strategy: Strategy,
+    rng: random.Random,
+    dealer: Optional[WordDealer] = None
+) -> Tuple[State, int]:
+    """
+    Plays a single game to the end, returns its final state and the
+    number of guesses it took.
+    """
+    state = init_state(config, rng=rng, dealer=dealer)
+    n_guesses = 0
+    while state.is_running:
+        # NOTE(andrea): target words may contain characters the player
+        # can never guess (e.g. capital letters), give up when we run
+        # out of characters instead of looping forever.
+        try:
+            guess = strategy(state, rng)
+        except (IndexError, RuntimeError):
+            break
+        update_game(state, guess)
+        n_guesses += 1
+    return state, n_guesses
+
+
+def _play_chunk(
+    config: Configurations,
+    strategy_name: str,
+    n_games: int,
+    seed: int
+) -> Dict[int, Outcome]:
+    strategy = make_strategy(strategy_name, config)
+    rng = random.Random(seed)
+    dealer = make_dealer(replace(config, seed=rng.getrandbits(64)))
+    out: Dict[int, Outcome] = {}
+    for _ in range(n_games):
+        start = time.perf_counter()
+        state, n_guesses = play(config, strategy, rng, dealer)
+        elapsed = time.perf_counter() - start
+
+        outcome = out.setdefault(
+            length_band(len(state.target_word)), Outcome())
+        outcome.games += 1
+        outcome.wins += state.is_victory
+        outcome.guesses += n_guesses
+        outcome.seconds += elapsed
+    return out
+
+
+def simulate(
+    n_games: int,
+    strategy_name: str,
+    difficulties: List[Difficulty],
+    config: Configurations = Configurations(),
+    workers: Optional[int] = None,
+    seed: Optional[int] = None,
+    chunk_size: int = 1000
+) -> Dict[Difficulty, Dict[int, Outcome]]:
+    """
+    Plays `n_games` games per difficulty over a pool of `workers`
+    processes and merges their outcomes by difficulty and length band.
+    """
+    if strategy_name not in STRATEGIES and \
+            strategy_name not in STRATEGY_FACTORIES:
+        raise ValueError(f"unknown strategy '{strategy_name}'")
+
+    master = random.Random(seed)
+    jobs = []
+    for difficulty in difficulties:
+        chunk_config = replace(config, difficulty=difficulty)
+        for start in range(0, n_games, chunk_size):
+            jobs.append((
+                difficulty,
+                chunk_config,
+                min(chunk_size, n_games - start),
+                master.getrandbits(64),
+            ))
+
+    results: Dict[Difficulty, Dict[int, Outcome]] = {
+        d: {} for d in difficulties}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            (difficulty, executor.submit(
+                _play_chunk, chunk_config, strategy_name, size, chunk_seed))
+            for difficulty, chunk_config, size, chunk_seed in jobs
+        ]
+        for difficulty, future in futures:
+            for band, outcome in future.result().items():
+                results[difficulty].setdefault(band, Outcome()).merge(outcome)
+    return results
+
+
+def format_report(
+    results: Dict[Difficulty, Dict[int, Outcome]],
+    wall_time: float
+) -> str:
+    lines = [
+        f"{'difficulty':<10} {'length':>9} {'games':>8} {'win rate':>9} "
+        f"{'guesses':>8} {'games/s':>10}"
+    ]
+    total = 0
+    for difficulty, bands in results.items():
+        lower = MIN_LENGTH
+        for bound in LENGTH_BANDS:
+            outcome = bands.get(bound)
+            band = f"{lower}-{bound}"
+            lower = bound + 1
+            if outcome is None or outcome.games == 0:
+                continue
+            total += outcome.games
+            lines.append(
+                f"{difficulty.value:<10} {band:>9} {outcome.games:>8} "
+                f"{outcome.wins / outcome.games:>9.1%} "
+                f"{outcome.guesses / outcome.games:>8.2f} "
+                f"{outcome.games / max(outcome.seconds, 1e-9):>10.0f}"
+            )
+    lines.append(
+        f"{total} games in {wall_time:.2f}s "
+        f"({total / max(wall_time, 1e-9):.0f} games/s overall)")
+    return "\n".join(lines)
+
+
+def main(argList: List[str]):
+    parser = ArgumentParser(description="hangman self-play simulation")
+    parser.add_argument(
+        "-n", "--games", type=int, default=10000,
+        help="number of games played per difficulty")
+    parser.add_argument(
+        "-s", "--strategy", default="frequency",
+        choices=sorted([*STRATEGIES, *STRATEGY_FACTORIES]),
+        help="guessing strategy of the automated player")
+    parser.add_argument(
+        "-d", "--difficulty", nargs="+", default=[d.value for d in Difficulty],
+        choices=[d.value for d in Difficulty],
+        help="difficulty levels to simulate")
+    parser.add_argument(
+        "-l", "--lives", type=int, default=MAX_LIVES,
+        help="number of lives of each game")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count(),
+        help="number of worker processes (default: all cores)")
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="seed of the simulation, for reproducible runs")
+    args = parser.parse_args(argList)
+
+    difficulties = [Difficulty(d) for d in args.difficulty]
+
+    # NOTE(andrea): load the tiers before forking, so that workers
+    # inherit them instead of loading them once each.
+    wordlist = load_wordlist()
+    for difficulty in difficulties:
+        wordlist.index(difficulty)
+
+    start = time.perf_counter()
+    results = simulate(
+        args.games,
+        args.strategy,
+        difficulties,
+        Configurations(lives=args.lives),
+        workers=args.workers,
+        seed=args.seed,
+    )
+    print(format_report(results, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,168 @@
+"""
+Candidate filtering solver. Keeps the words of a tier that are still
+consistent with a game `State` and suggests the next letter to guess.
+
+Each length bucket of the tier is stored as a `uint8` matrix with one
+row per word, so that filtering a state is a handful of vectorized
+comparisons instead of a Python loop over the words. Every bucket also
+gets a table of how many times each letter occurs in each word.
+
+`Hints` follows a single game: its candidates are narrowed with the new
+guesses only, so a suggestion never rescans the words of the tier.
+"""
+from string import ascii_lowercase
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from hangman.data import State
+from hangman.index import LengthIndex
+
+_GUESSABLE = np.frombuffer(ascii_lowercase.encode('ascii'), dtype=np.uint8)
+
+
+class Solver:
+    """
+    Solver over the words of a single tier.
+    """
+
+    def __init__(self, index: LengthIndex):
+        self.index = index
+        self._tables: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._hints: Optional[Hints] = None
+
+    def _table(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        try:
+            return self._tables[length]
+        except KeyError:
+            pass
+        span = self.index.span(length, length)
+        blob = ''.join(
+            self.index.words[i] for i in span).encode('ascii')
+        matrix = np.frombuffer(blob, dtype=np.uint8).reshape(len(span), length)
+        counts = (matrix[:, :, None] == _GUESSABLE).sum(
+            axis=1, dtype=np.uint8)
+        self._tables[length] = matrix, counts
+        return matrix, counts
+
+    def prepare(self, length: int):
+        """
+        Builds the tables of the words of the given length now instead
+        of on first use.
+        """
+        self._table(length)
+
+    def matrix(self, length: int) -> np.ndarray:
+        """
+        Returns the words of the given length as a `(words, length)`
+        matrix of character codes. Built on first use.
+        """
+        return self._table(length)[0]
+
+    def letter_counts(self, length: int) -> np.ndarray:
+        """
+        Returns, for the words of the given length, a `(words, 26)`
+        matrix of the number of occurrences of every lowercase letter.
+        Built on first use.
+        """
+        return self._table(length)[1]
+
+    def hints(self, state: State) -> 'Hints':
+        """
+        Returns the hints of the game of `state`. The hints of the last
+        game are kept, so that asking again during the same game only
+        narrows them with the new guesses.
+        """
+        if self._hints is None or self._hints.state is not state:
+            self._hints = Hints(self, state)
+        return self._hints
+
+    def candidates(self, state: State) -> np.ndarray:
+        """
+        Returns the rows of `matrix(len(state.target_word))` that are
+        consistent with what the state reveals.
+        """
+        rows = self.hints(state).rows()
+        candidates: np.ndarray = self.matrix(len(state.target_word))[rows]
+        return candidates
+
+    def best_letter(self, state: State) -> Optional[str]:
+        """
+        Suggests the unguessed lowercase letter contained in the most
+        candidate words, the most frequent one on ties. Returns `None` if
+        no candidate contains any.
+        """
+        return self.hints(state).suggest()
+
+    def candidate_words(self, state: State) -> List[str]:
+        return [row.tobytes().decode('ascii')
+                for row in self.candidates(state)]
+
+
+class Hints:
+    """
+    Suggests letters during a single game. The candidate words are kept
+    as rows of the solver matrix, narrowed by the guesses made since the
+    last suggestion.
+    """
+
+    __slots__ = ('solver', 'state', '_rows', '_letters', '_words')
+
+    def __init__(self, solver: Solver, state: State):
+        self.solver = solver
+        self.state = state
+        self._rows = np.arange(len(solver.matrix(len(state.target_word))))
+        # number of guessed characters and words applied to `_rows`
+        self._letters = 0
+        self._words = 0
+
+    def rows(self) -> np.ndarray:
+        """
+        Returns the rows of the words consistent with the state.
+        """
+        state = self.state
+        if len(state.history) > self._letters:
+            matrix = self.solver.matrix(len(state.target_word))
+            revealed = np.frombuffer(
+                ''.join(state.revealed).encode('ascii'), dtype=np.uint8)
+            # NOTE(andrea): every occurrence of a guessed letter is
+            # revealed, so a candidate has it exactly where it is shown.
+            # This covers the missed letters as well.
+            for c in state.history[self._letters:]:
+                code = ord(c)
+                words = matrix[self._rows]
+                keep = np.all((words == code) == (revealed == code), axis=1)
+                self._rows = self._rows[keep]
+            self._letters = len(state.history)
+
+        if len(state.words) > self._words:
+            matrix = self.solver.matrix(len(state.target_word))
+            for word in state.words[self._words:]:
+                if len(word) == matrix.shape[1]:
+                    row = np.frombuffer(word.encode('ascii'), dtype=np.uint8)
+                    keep = ~np.all(matrix[self._rows] == row, axis=1)
+                    self._rows = self._rows[keep]
+            self._words = len(state.words)
+        return self._rows
+
+    def suggest(self) -> Optional[str]:
+        """
+        Suggests the unguessed lowercase letter contained in the most
+        candidate words, the most frequent one on ties. Returns `None` if
+        no candidate contains any.
+        """
+        length = len(self.state.target_word)
+        counts = self.solver.letter_counts(length)[self.rows()]
+        presence = (counts > 0).sum(axis=0, dtype=np.int64)
+        frequency = counts.sum(axis=0, dtype=np.int64)
+        # NOTE(andrea): a letter is in some word iff it occurs at all, so
+        # only the letters of no candidate have a null score.
+        scores = presence * (int(frequency.max(initial=0)) + 1) + frequency
+        guessed = [
+            ord(c) - ord('a') for c in self.state.history
+            if c in ascii_lowercase]
+        scores[guessed] = 0
+        best = int(scores.argmax())
+        if scores[best] == 0:
+            return None
+        return ascii_lowercase[best]
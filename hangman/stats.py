@@ -0,0 +1,228 @@
+"""
+Local statistics of the games played, in a SQLite database.
+
+Games are recorded from the game loop without touching the database:
+they are queued and a background thread writes them in batches, one
+transaction per batch. The database runs in WAL mode, so reports can be
+read while games are being recorded.
+"""
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from hangman.data import State
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS games (
+    id          INTEGER PRIMARY KEY,
+    played_at   REAL NOT NULL,
+    lang        TEXT NOT NULL,
+    difficulty  TEXT NOT NULL,
+    word        TEXT NOT NULL,
+    victory     INTEGER NOT NULL,
+    lives       INTEGER NOT NULL,
+    n_guesses   INTEGER NOT NULL,
+    guesses     TEXT NOT NULL,
+    duration    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_word ON games (word, victory);
+CREATE INDEX IF NOT EXISTS games_by_difficulty
+    ON games (difficulty, victory, n_guesses, duration);
+'''
+
+_INSERT = '''
+INSERT INTO games (played_at, lang, difficulty, word, victory, lives,
+                   n_guesses, guesses, duration)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+Row = Tuple[float, str, str, str, int, int, int, str, float]
+
+# sentinel telling the writer thread to stop
+_STOP = None
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Opens the database, creating its tables if needed.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute('PRAGMA journal_mode=WAL')
+    # NOTE(andrea): in WAL mode, this only gives up durability of the
+    # last transactions on power loss, never consistency.
+    connection.execute('PRAGMA synchronous=NORMAL')
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def connect_read_only(path: str) -> sqlite3.Connection:
+    """
+    Opens an existing database without changing it: neither its tables
+    nor its journal mode are touched.
+    """
+    uri = pathlib.Path(os.path.abspath(path)).as_uri()
+    return sqlite3.connect(f'{uri}?mode=ro', uri=True)
+
+
+class StatsStore:
+    """
+    Records finished games. Games are written by a background thread,
+    in batches of at most `batch_size`, at most `flush_interval` seconds
+    after they are recorded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        batch_size: int = 256,
+        flush_interval: float = 1.0
+    ):
+        # NOTE(andrea): opened here, so that a bad path is reported
+        # before the first game.
+        connect(path).close()
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: 'queue.Queue[Optional[Row]]' = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write, name='hangman-stats', daemon=True)
+        self._writer.start()
+
+    def __enter__(self) -> 'StatsStore':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(
+        self,
+        state: State,
+        difficulty: str,
+        lang: str,
+        duration: float
+    ):
+        """
+        Queues a finished game, does not wait for it to be written.
+        `difficulty` is the tier or the percentile band the word was
+        picked from, see `Configurations.difficulty_label`.
+        """
+        self._queue.put((
+            time.time(),
+            lang,
+            difficulty,
+            state.target_word,
+            int(state.is_victory),
+            state.current_lives,
+            len(state.guesses),
+            ' '.join(g.guess for g in state.guesses),
+            duration,
+        ))
+
+    def close(self):
+        """
+        Writes the pending games and stops the writer thread.
+        """
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+    def _write(self):
+        connection = connect(self._path)
+        try:
+            stopping = False
+            while not stopping:
+                batch: List[Row] = []
+                row = self._queue.get()
+                deadline = time.monotonic() + self._flush_interval
+                while True:
+                    if row is _STOP:
+                        stopping = True
+                        break
+                    batch.append(row)
+                    if len(batch) >= self._batch_size:
+                        break
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        break
+                    try:
+                        row = self._queue.get(timeout=timeout)
+                    except queue.Empty:
+                        break
+                if batch:
+                    with connection:
+                        connection.executemany(_INSERT, batch)
+        finally:
+            connection.close()
+
+
+def difficulty_win_rates(
+    connection: sqlite3.Connection
+) -> List[Tuple[str, int, int, float, float]]:
+    """
+    Returns, per difficulty, the number of games, the number of wins,
+    the average number of guesses and the average duration.
+    """
+    return connection.execute('''
+        SELECT difficulty, count(*), sum(victory), avg(n_guesses),
+               avg(duration)
+        FROM games GROUP BY difficulty ORDER BY difficulty
+    ''').fetchall()
+
+
+def word_win_rate(
+    connection: sqlite3.Connection,
+    word: str
+) -> Tuple[int, int]:
+    """
+    Returns the number of games played with `word` and how many of them
+    were won.
+    """
+    games, wins = connection.execute(
+        'SELECT count(*), sum(victory) FROM games WHERE word = ?',
+        (word,)
+    ).fetchone()
+    return games, wins or 0
+
+
+def hardest_words(
+    connection: sqlite3.Connection,
+    limit: int = 10,
+    min_games: int = 2
+) -> List[Tuple[str, int, int]]:
+    """
+    Returns the words with the lowest win rate among the ones played at
+    least `min_games` times, with their number of games and wins.
+    """
+    return connection.execute('''
+        SELECT word, count(*) AS games, sum(victory) AS wins
+        FROM games GROUP BY word HAVING games >= ?
+        ORDER BY 1.0 * wins / games, games DESC, word LIMIT ?
+    ''', (min_games, limit)).fetchall()
+
+
+def report(path: str) -> str:
+    connection = connect_read_only(path)
+    try:
+        lines = [
+            f"{'difficulty':<10} {'games':>8} {'win rate':>9} "
+            f"{'guesses':>8} {'time (s)':>9}"
+        ]
+        for difficulty, games, wins, guesses, duration in \
+                difficulty_win_rates(connection):
+            lines.append(
+                f"{difficulty:<10} {games:>8} {wins / games:>9.1%} "
+                f"{guesses:>8.2f} {duration:>9.1f}")
+
+        hardest = hardest_words(connection)
+        if hardest:
+            lines.append("\nhardest words:")
+            for word, games, wins in hardest:
+                lines.append(
+                    f"{word:<24} {games:>8} {wins / games:>9.1%}")
+    finally:
+        connection.close()
+    return "\n".join(lines)
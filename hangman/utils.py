@@ -1,26 +1,138 @@
+import inspect
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from dataclasses import fields
+from functools import wraps
+from typing import Any, Callable, Hashable, List, Optional, Tuple
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
 
-def _cache(f, *args, **kwargs):
-    key = (args, frozenset(kwargs.items())) if kwargs else args
-    try:
-        return f.cache[key]
-    except KeyError:
-        value = f(*args, **kwargs)
-        f.cache[key] = value
-        return value
 
+def cached(
+    f: Optional[Callable] = None,
+    *,
+    maxsize: Optional[int] = 128,
+    ttl: Optional[float] = None,
+    stamp: Optional[Callable[..., Hashable]] = None
+) -> Callable:
+    """
+    Memoizes a function on its (default-applied) arguments.
+    Can be used both as `@cached` and `@cached(...)`.
+
+    - `maxsize` bounds the number of entries, evicting the least recently
+      used one (`None` means unbounded).
+    - `ttl` is the number of seconds after which an entry expires.
+    - `stamp` is called with the same arguments as the function, and an
+      entry is recomputed whenever the returned value changes (e.g. the
+      modification time of a file the function reads).
+
+    The wrapper exposes `cache_info()` and `cache_clear()`, and is safe to
+    call from multiple threads. The function itself runs outside the lock,
+    so concurrent misses on the same key may compute it more than once.
+    """
+    if f is None:
+        return lambda g: cached(g, maxsize=maxsize, ttl=ttl, stamp=stamp)
 
-def cached(f):
-    f.cache = {}
+    signature = inspect.signature(f)
+    cache: 'OrderedDict[Hashable, Any]' = OrderedDict()
+    lock = threading.Lock()
+    stats = {'hits': 0, 'misses': 0}
 
+    @wraps(f)
     def inner(*args, **kwargs):
-        return _cache(f, *args, **kwargs)
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (bound.args, frozenset(bound.kwargs.items()))
+        current = stamp(*bound.args, **bound.kwargs) if stamp else None
+        now = time.monotonic()
+
+        with lock:
+            entry = cache.get(key)
+            if entry is not None:
+                value, expires, entry_stamp = entry
+                if entry_stamp == current and (
+                    expires is None or now < expires
+                ):
+                    cache.move_to_end(key)
+                    stats['hits'] += 1
+                    return value
+                del cache[key]
+            stats['misses'] += 1
+
+        value = f(*args, **kwargs)
+        expires = now + ttl if ttl is not None else None
+
+        with lock:
+            cache[key] = (value, expires, current)
+            cache.move_to_end(key)
+            if maxsize is not None:
+                while len(cache) > maxsize:
+                    cache.popitem(last=False)
+        return value
+
+    def cache_info() -> CacheInfo:
+        with lock:
+            return CacheInfo(
+                stats['hits'], stats['misses'], maxsize, len(cache))
 
+    def cache_clear():
+        with lock:
+            cache.clear()
+            stats['hits'] = stats['misses'] = 0
+
+    inner.cache_info = cache_info  # type: ignore
+    inner.cache_clear = cache_clear  # type: ignore
     return inner
 
 
+def slotted(cls):
+    """
+    Rebuilds a dataclass with `__slots__`, so that its instances have no
+    `__dict__`. Equivalent to `@dataclass(slots=True)` from Python 3.10.
+    """
+    names = tuple(f.name for f in fields(cls))
+    body = {
+        k: v for k, v in cls.__dict__.items()
+        if k not in names and k not in ('__dict__', '__weakref__')
+    }
+    body['__slots__'] = names
+
+    if cls.__dataclass_params__.frozen:
+        # NOTE(andrea): the default pickling of slotted objects uses
+        # setattr, which frozen dataclasses forbid.
+        def __getstate__(self):
+            return [getattr(self, name) for name in names]
+
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        body['__getstate__'] = __getstate__
+        body['__setstate__'] = __setstate__
+
+    new_cls = type(cls)(cls.__name__, cls.__bases__, body)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
+def file_stamp(*paths: str) -> Hashable:
+    """
+    Identifies the current version of the given files by their
+    modification time and size. Missing files are stamped as `None`.
+    """
+    out: List[Optional[Tuple[int, int]]] = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            out.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
 def get_resource_path(relative_path: str) -> str:
     """
     Get absolute path to resource both in dev mode
@@ -1,40 +1,138 @@
+import atexit
+import signal
 import sys
+import time
+from typing import TYPE_CHECKING, Optional
 
-from hangman.core import init_state, update_game
+from hangman import profiling
+from hangman.core import init_state, make_dealer, make_hint, update_game
+from hangman.data import Configurations
 from hangman.io import (display, get_guess, get_play_new_game, parse_args,
                         print_info)
 
+if TYPE_CHECKING:
+    from hangman.journal import Journal
+    from hangman.stats import StatsStore
 
-def main():
-    try:
-        config = parse_args(sys.argv[1:])
-        is_prog_running = True
-    except ValueError:
-        print_info('Please try to start the game with different arguments.')
-        is_prog_running = False
 
-    while is_prog_running:
-        state = init_state(config)
+def _terminate(signum, frame):
+    raise SystemExit(128 + signum)
+
+
+def play_games(
+    config: Configurations,
+    journal: Optional['Journal'] = None,
+    stats: Optional['StatsStore'] = None
+):
+    """
+    Plays local games until the player does not want a new one.
+    """
+    # NOTE(andrea): created once, so that no word is repeated before
+    # all the words of the configuration were played.
+    dealer = make_dealer(config)
+    available = f"{len(dealer)} words can be picked with this configuration"
+    hint = make_hint(config)
+
+    is_playing = True
+    while is_playing:
+        state = init_state(config, dealer=dealer)
+        game = journal.start(state) if journal is not None else 0
+        started = time.monotonic()
         display(state)
+        # NOTE(andrea): printed below the first screen, drawing it clears
+        # the terminal.
+        if available:
+            print_info(available)
+            available = ''
+        # NOTE(andrea): built while the player reads the first screen,
+        # so that asking for a hint does not wait for it.
+        hint.prepare(state)
 
         try:
             while state.is_running:
                 try:
-                    guess = get_guess(state)
-                    update_game(state, guess)
-                    display(state)
+                    guess = get_guess(state, hint)
+                    with profiling.phase('turn'):
+                        is_new = not state.has_guessed(guess)
+                        update_game(state, guess)
+                        if journal is not None and is_new:
+                            journal.guess(game, state, guess)
+                            if not state.is_running:
+                                journal.end(game, state)
+                        if stats is not None and not state.is_running:
+                            stats.record(
+                                state, config.difficulty_label, config.lang,
+                                time.monotonic() - started)
+                        display(state)
                 except (KeyboardInterrupt, EOFError):
                     state.is_running = False
                     # NOTE(andrea): this is just for aesthetic purposes
                     print('\n')
 
-            is_prog_running = get_play_new_game()
+            is_playing = get_play_new_game()
 
         except (KeyboardInterrupt, EOFError):
-            is_prog_running = False
+            is_playing = False
             # NOTE(andrea): this is just for aesthetic purposes
             print('\n')
 
+
+def main():
+    try:
+        config = parse_args(sys.argv[1:])
+        is_prog_running = True
+    except ValueError:
+        print_info('Please try to start the game with different arguments.')
+        is_prog_running = False
+
+    if profiling.is_enabled():
+        # NOTE(andrea): registered at exit, so that the server and the
+        # batch mode are reported as well.
+        atexit.register(
+            lambda: print(profiling.report(), file=sys.stderr))
+
+    if is_prog_running and config.stats is not None:
+        from hangman.stats import report
+        print(report(config.stats))
+        return
+
+    if is_prog_running and config.serve is not None:
+        # NOTE(andrea): imported here so that local games do not pay
+        # for loading asyncio.
+        from hangman.server import run_server
+        run_server(config)
+        return
+
+    if is_prog_running and config.batch is not None:
+        from hangman.batch import run
+        run(config)
+        return
+
+    # NOTE(andrea): a terminated game closes its journal and its stats
+    # like a game that was quit.
+    signal.signal(signal.SIGTERM, _terminate)
+
+    journal = None
+    if is_prog_running and config.journal is not None:
+        from hangman.journal import Journal
+        journal = Journal(config.journal)
+
+    stats = None
+    if is_prog_running and config.record is not None:
+        # NOTE(andrea): imported here so that games that are not
+        # recorded do not pay for loading sqlite3.
+        from hangman.stats import StatsStore
+        stats = StatsStore(config.record)
+
+    try:
+        if is_prog_running:
+            play_games(config, journal, stats)
+    finally:
+        if journal is not None:
+            journal.close()
+        if stats is not None:
+            stats.close()
+
     print('Thank your for playing')
 
 
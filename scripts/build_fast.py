@@ -0,0 +1,59 @@
+"""
+Builds the startup-optimized executable. The packed wordlists are first
+embedded in `hangman/_wordlists_data.py`, then PyInstaller bundles the
+game as a folder, so that nothing is extracted when it is launched.
+
+The build fails if the embedded module cannot be imported, instead of
+producing an executable without any wordlist.
+
+Usage: python3 build_fast.py --name hangman-cli_linux_x64
+"""
+import importlib
+import os
+import subprocess
+import sys
+from argparse import ArgumentParser
+from typing import List
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+
+from hangman.packed import EMBEDDED_MODULE, compile_wordlists  # noqa: E402
+
+SOURCE = os.path.join(ROOT, 'assets', 'wordlists.json')
+
+
+def embed_wordlists(source: str = SOURCE) -> str:
+    """
+    Generates the embedded module and checks that it can be imported.
+    Returns its path.
+    """
+    path = os.path.join(ROOT, *EMBEDDED_MODULE.split('.')) + '.py'
+    compile_wordlists(source, path, embed=True)
+    importlib.invalidate_caches()
+    if not getattr(importlib.import_module(EMBEDDED_MODULE), 'DATA', None):
+        raise RuntimeError(f"{path} holds no wordlist")
+    return path
+
+
+def main(argList: List[str]):
+    parser = ArgumentParser(
+        description="builds the startup-optimized executable")
+    parser.add_argument(
+        "--name", required=True, help="name of the executable")
+    args = parser.parse_args(argList)
+
+    embed_wordlists()
+    subprocess.run([
+        sys.executable, '-m', 'PyInstaller', '--onedir', 'main.py',
+        '--hidden-import', EMBEDDED_MODULE,
+        # NOTE(andrea): hints use the bitsets of `hangman.patterns`
+        # without numpy.
+        '--exclude-module', 'numpy',
+        '--exclude-module', 'tkinter',
+        '--name', args.name,
+    ], cwd=ROOT, check=True)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -1,56 +1,152 @@
+"""
+Splits a dictionary (one word per line) into easy, medium and hard
+words, and writes them in the format of `assets/wordlists.json`.
+
+The difficulty score of a word is the sum of the inverse frequencies of
+its letters. Words scoring below `median - stddev/2` are easy, words
+above `median + stddev/2` are hard and the rest are medium. Words that
+are not made of ASCII letters only are discarded.
+
+The dictionary is streamed twice in chunks: once to compute the scores
+and the thresholds, once to assign every word to its tier. Only the
+scores (4 bytes per word) are kept in memory.
+
+Usage: python3 classifier.py <dictionary> [-o wordlists.json]
+"""
+import json
+import os
+import shutil
 import sys
+import tempfile
+from argparse import ArgumentParser
+from typing import IO, Iterator, List, Tuple
+
 import numpy as np
 
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from hangman.constants import LETTER_FREQUENCIES  # noqa: E402
+
+TIERS = ('easy', 'medium', 'hard')
+
+CHUNK_SIZE = 1 << 22
+
+# score contribution of every byte, NaN for bytes that are not letters
+score_table = np.full(256, np.nan, dtype=np.float64)
+for letter, freq in LETTER_FREQUENCIES.items():
+    score_table[ord(letter)] = 1 / freq
+    score_table[ord(letter.lower())] = 1 / freq
+# NOTE: newlines terminate words and add nothing to their score
+score_table[ord('\n')] = 0
+
+
+def iter_chunks(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Reads the file in chunks that end on a line boundary.
+    Carriage returns are dropped and every chunk ends with a newline.
+    """
+    rest = b''
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            block = rest + block.replace(b'\r', b'')
+            cut = block.rfind(b'\n') + 1
+            rest = block[cut:]
+            if cut:
+                yield block[:cut]
+    if rest:
+        yield rest + b'\n'
+
+
+def score_chunk(chunk: bytes) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Scores every line of a chunk. Returns the start and end offsets of
+    the valid words in the chunk and their scores.
+    """
+    data = np.frombuffer(chunk, dtype=np.uint8)
+    ends = np.flatnonzero(data == ord('\n'))
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+
+    scores = np.add.reduceat(score_table[data], starts)
+    valid = (ends > starts) & ~np.isnan(scores)
+    return starts[valid], ends[valid], scores[valid]
+
+
+def compute_thresholds(path: str) -> Tuple[float, float, int]:
+    scores: List[np.ndarray] = []
+    for chunk in iter_chunks(path):
+        scores.append(score_chunk(chunk)[2].astype(np.float32))
+    all_scores = np.concatenate(scores) if scores else np.zeros(0)
+    if len(all_scores) == 0:
+        raise ValueError("the dictionary contains no valid words")
+
+    median = np.median(all_scores)
+    stddev = np.std(all_scores)
+    return median - stddev/2, median + stddev/2, len(all_scores)
+
+
+def write_tiers(
+    path: str,
+    out: IO[str],
+    lang: str,
+    easy_ends: float,
+    hard_start: float
+):
+    """
+    Streams the words of the dictionary into one temporary file per
+    tier, then joins them into a JSON document.
+    """
+    buffers = [tempfile.TemporaryFile('w+') for _ in TIERS]
+    counts = [0 for _ in TIERS]
+    for chunk in iter_chunks(path):
+        starts, ends, scores = score_chunk(chunk)
+        tiers = (scores > easy_ends).astype(np.int8) + (scores >= hard_start)
+        for start, end, tier in zip(starts, ends, tiers):
+            word = chunk[start:end].decode('ascii')
+            separator = ',\n' if counts[tier] else ''
+            buffers[tier].write(f"{separator}      {json.dumps(word)}")
+            counts[tier] += 1
+
+    out.write(f"{{\n  {json.dumps(lang)}: {{\n")
+    for i, (tier, buffer) in enumerate(zip(TIERS, buffers)):
+        out.write(f"    \"{tier}\": [\n")
+        buffer.seek(0)
+        shutil.copyfileobj(buffer, out)
+        buffer.close()
+        closing = "," if i < len(TIERS) - 1 else ""
+        out.write(f"\n    ]{closing}\n" if counts[i] else f"    ]{closing}\n")
+    out.write("  }\n}\n")
+
+
+def main(argList: List[str]):
+    parser = ArgumentParser(
+        description="splits a dictionary into difficulty tiers")
+    parser.add_argument("dictionary", help="file with one word per line")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="path of the JSON wordlist to write (default: stdout)")
+    parser.add_argument(
+        "--lang", default="BRITISH",
+        help="language key of the wordlist (default: BRITISH)")
+    args = parser.parse_args(argList)
+
+    easy_ends, hard_start, n_words = compute_thresholds(args.dictionary)
+    print(
+        f"{n_words} words, easy below {easy_ends}, hard from {hard_start}",
+        file=sys.stderr)
+
+    if args.output == '-':
+        write_tiers(args.dictionary, sys.stdout, args.lang,
+                    easy_ends, hard_start)
+    else:
+        with open(args.output, 'w') as f:
+            write_tiers(args.dictionary, f, args.lang, easy_ends, hard_start)
+
 
-freq_table = {
-        "E": 56.88,
-        "M": 15.36,
-        "A": 43.31,
-        "H": 15.31,
-        "R": 38.64,
-        "G": 12.59,
-        "I": 38.45,
-        "B": 10.56,
-        "O": 36.51,
-        "F": 9.24,
-        "T": 35.43,
-        "Y": 9.06,
-        "N": 33.92,
-        "W": 6.57,
-        "S": 29.23,
-        "K": 5.61,
-        "L": 27.98,
-        "V": 5.13,
-        "C": 23.13,
-        "X": 1.48,
-        "U": 18.51,
-        "Z": 1.39,
-        "D": 17.25,
-        "J": 1.00,
-        "P": 16.14,
-        "Q": 1,
-}
-
-diff_list = []
-
-if len(sys.argv) < 2:
-    print("Usage: python3 classifier.py <dictionary>")
-    exit(1)
-
-with open(sys.argv[1]) as f:
-    words = filter(lambda s: s.isalpha() and all(ord(c) < 128 for c in s), f.read().split('\n'))
-    for word in words:
-        score = sum([(1/freq_table[c.upper()]) for c in word])
-        diff_list.append((word, score))
-
-scores = list(map(lambda t: t[1], diff_list))
-scores_as_nparray = np.asarray(scores, dtype=np.float32)
-
-median = np.median(scores_as_nparray)
-stddev = np.std(scores_as_nparray)
-
-easy_ends = median - stddev/2
-hard_start = median + stddev/2
-print("{},{}".format(easy_ends, hard_start))
-for (word, score) in diff_list:
-    print("{},{}".format(word, score))
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,153 @@
+"""
+Builds a tiered wordlist from one or more raw dictionaries and stores
+it under the given language in `assets/wordlists.json`.
+
+The dictionaries are cut into shards on line boundaries and a pool of
+processes normalizes (Unicode NFKC, surrounding whitespace), filters
+(ASCII letters only), deduplicates and scores the words of every shard.
+The shards are then merged, deduplicated again, and split into tiers
+with the same thresholds as `classifier.py`.
+
+Memory: a worker holds a single shard at a time, and only its distinct
+valid words are sent back. The raw dictionaries are never held in memory
+at once: the main process keeps every distinct word and its score once,
+which is the wordlist being written anyway.
+
+Usage: python3 ingest.py <dictionary>... --lang BRITISH
+"""
+import json
+import os
+import sys
+import time
+import unicodedata
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from classifier import TIERS, score_chunk
+
+SHARD_SIZE = 1 << 22
+
+Shard = Tuple[str, int, int]
+
+
+def make_shards(path: str, shard_size: int = SHARD_SIZE) -> List[Shard]:
+    """
+    Cuts a file into `(path, start, end)` byte ranges of roughly
+    `shard_size` bytes that start and end on line boundaries.
+    """
+    size = os.path.getsize(path)
+    shards = []
+    start = 0
+    with open(path, 'rb') as f:
+        while start < size:
+            end = min(start + shard_size, size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            shards.append((path, start, end))
+            start = end
+    return shards
+
+
+def process_shard(shard: Shard) -> Tuple[List[str], np.ndarray]:
+    """
+    Returns the distinct valid words of a shard and their scores.
+    """
+    path, start, end = shard
+    with open(path, 'rb') as f:
+        f.seek(start)
+        raw = f.read(end - start)
+
+    text = unicodedata.normalize(
+        'NFKC', raw.decode('utf-8', errors='replace'))
+    lines = (line.strip() for line in text.splitlines())
+    # NOTE: non ASCII characters become '?', which is not a letter,
+    # so score_chunk discards the whole word.
+    chunk = '\n'.join(dict.fromkeys(
+        line for line in lines if line)).encode('ascii', 'replace') + b'\n'
+
+    starts, ends, scores = score_chunk(chunk)
+    words = [chunk[s:e].decode('ascii') for s, e in zip(starts, ends)]
+    return words, scores.astype(np.float32)
+
+
+def ingest(
+    paths: List[str],
+    workers: int,
+    shard_size: int = SHARD_SIZE
+) -> Dict[str, List[str]]:
+    """
+    Returns the distinct valid words of the dictionaries by tier, each
+    tier sorted.
+    """
+    shards = [
+        shard for path in paths for shard in make_shards(path, shard_size)]
+
+    scores: Dict[str, float] = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for words, shard_scores in executor.map(process_shard, shards):
+            for word, score in zip(words, shard_scores.tolist()):
+                scores.setdefault(word, score)
+    if not scores:
+        raise ValueError("the dictionaries contain no valid words")
+
+    all_scores = np.fromiter(
+        scores.values(), dtype=np.float32, count=len(scores))
+    median = np.median(all_scores)
+    stddev = np.std(all_scores)
+    easy_ends, hard_start = median - stddev/2, median + stddev/2
+    print(
+        f"{len(scores)} words, easy below {easy_ends}, "
+        f"hard from {hard_start}",
+        file=sys.stderr)
+
+    tiers: Dict[str, List[str]] = {tier: [] for tier in TIERS}
+    for word, score in scores.items():
+        if score <= easy_ends:
+            tiers['easy'].append(word)
+        elif score >= hard_start:
+            tiers['hard'].append(word)
+        else:
+            tiers['medium'].append(word)
+    for words in tiers.values():
+        words.sort()
+    return tiers
+
+
+def main(argList: List[str]):
+    parser = ArgumentParser(
+        description="builds a tiered wordlist from raw dictionaries")
+    parser.add_argument(
+        "dictionaries", nargs="+", help="files with one word per line")
+    parser.add_argument(
+        "--lang", required=True, help="language key of the wordlist")
+    parser.add_argument(
+        "-o", "--output", default="assets/wordlists.json",
+        help="JSON wordlist to update (default: assets/wordlists.json)")
+    parser.add_argument(
+        "-j", "--workers", type=int, default=os.cpu_count(),
+        help="number of worker processes (default: all cores)")
+    args = parser.parse_args(argList)
+
+    start = time.perf_counter()
+    tiers = ingest(args.dictionaries, args.workers)
+
+    # NOTE: the other languages of the file are left untouched.
+    data = {}
+    if os.path.exists(args.output):
+        with open(args.output, 'r') as f:
+            data = json.load(f)
+    data[args.lang] = tiers
+    with open(args.output, 'w') as f:
+        json.dump(data, f, indent=2)
+        f.write('\n')
+
+    print(f"done in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,92 @@
+import json
+from io import StringIO
+
+import pytest
+
+from hangman.batch import play_record, run_batch
+from hangman.data import Configurations, Difficulty, WordList
+
+WORDLIST = WordList(easy=["ace", "cab"], medium=["penguin"], hard=["hard"])
+
+
+def test_play_record():
+    config = Configurations(lives=2)
+    assert play_record(
+        {"word": "penguin", "guesses": ["p", "P", "x", "?", "pen", "e"]},
+        config, WORDLIST
+    ) == {
+        "word": "penguin",
+        "seed": None,
+        "victory": False,
+        "finished": False,
+        "lives": 1,
+        "guesses": 3,
+        "revealed": "pe_____",
+        "rejected": 3,
+    }
+
+    result = play_record(
+        {"seed": 1, "guesses": ["x", "y", "z"]}, config, WORDLIST)
+    assert result["word"] == "penguin"
+    assert result["finished"] and not result["victory"]
+    assert result["guesses"] == 2
+
+
+def test_seeded_records_are_reproducible():
+    config = Configurations(difficulty=Difficulty.EASY)
+    words = {
+        play_record({"seed": seed}, config, WORDLIST)["word"]
+        for seed in range(20)
+    }
+    assert words == {"ace", "cab"}
+    for seed in range(20):
+        assert (
+            play_record({"seed": seed}, config, WORDLIST) ==
+            play_record({"seed": seed}, config, WORDLIST)
+        )
+
+
+def test_run_batch():
+    source = StringIO(
+        '{"word": "ace", "guesses": ["a", "c", "e", "x"]}\n'
+        '\n'
+        'not json\n'
+        '{"word": "ace", "guesses": ["ace"]}\n'
+    )
+    out = StringIO()
+    assert run_batch(Configurations(), source, out, WORDLIST) == 2
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert len(results) == 3
+    assert results[0]["victory"] and results[0]["guesses"] == 3
+    assert results[1]["line"] == 3 and "error" in results[1]
+    assert results[2]["victory"] and results[2]["guesses"] == 1
+
+
+def test_invalid_records():
+    source = StringIO(
+        '{"word": 5}\n'
+        '{"word": "Penguin", "guesses": ["p"]}\n'
+        '{"word": "", "guesses": []}\n'
+        '{"word": "ace", "guesses": 7}\n'
+        '{"seed": [1], "guesses": []}\n'
+        '{"seed": 1, "guesses": ["a"]}\n'
+    )
+    out = StringIO()
+    assert run_batch(Configurations(), source, out, WORDLIST) == 1
+
+    results = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [r.get("line") for r in results] == [1, 2, 3, 4, 5, None]
+    assert all("error" in r for r in results[:5])
+    assert results[5]["word"] == "penguin"
+
+
+def test_results_are_written_when_interrupted():
+    def source():
+        yield '{"word": "ace", "guesses": ["a"]}\n'
+        raise KeyboardInterrupt
+
+    out = StringIO()
+    with pytest.raises(KeyboardInterrupt):
+        run_batch(Configurations(), source(), out, WORDLIST)
+    assert json.loads(out.getvalue())["revealed"] == "a__"
@@ -0,0 +1,50 @@
+import json
+import os
+import sys
+
+import pytest as pt
+
+pt.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from classifier import (compute_thresholds, iter_chunks,  # noqa: E402
+                        main, score_chunk)
+
+WORDS = ["a", "bee", "ZOO", "quiz", "jazz", "", "naïve", "it's", "eel",
+         "tree", "Queue", "kiwi", "ox", "syzygy"]
+
+
+def test_iter_chunks(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    path.write_bytes("\r\n".join(WORDS).encode('utf-8'))
+
+    chunks = list(iter_chunks(str(path), chunk_size=7))
+    assert len(chunks) > 1
+    # every chunk ends on a line boundary, no line is split or lost
+    assert all(chunk.endswith(b'\n') for chunk in chunks)
+    assert b''.join(chunks).decode('utf-8').split('\n')[:-1] == WORDS
+
+
+def test_classify(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    path.write_text("\n".join(WORDS))
+    output = tmp_path / "wordlists.json"
+
+    main([str(path), "-o", str(output), "--lang", "TEST"])
+    tiers = json.loads(output.read_text())["TEST"]
+
+    # words that are not made of ASCII letters only are discarded
+    valid = [w for w in WORDS if w.isascii() and w.isalpha()]
+    assert sorted(w for tier in tiers.values() for w in tier) == \
+        sorted(valid)
+
+    easy_ends, hard_start, n_words = compute_thresholds(str(path))
+    assert n_words == len(valid)
+    for tier, words in tiers.items():
+        for word in words:
+            score = score_chunk(f"{word}\n".encode('ascii'))[2][0]
+            expected = (
+                "easy" if score <= easy_ends else
+                "hard" if score >= hard_start else "medium")
+            assert tier == expected
@@ -149,3 +149,91 @@ def test_is_word_found():
         guesses=[Guess('a'), Guess('c'), Guess('x')]
     )
     assert not is_word_found(state)
+
+
+def test_pick_word_length_range():
+    wordlist = WordList(
+        easy=["abcd", "ab", "abcdef", "abc", "abcde"], medium=[], hard=[])
+
+    for _ in range(20):
+        assert 3 <= len(pick_word(3, 4, Difficulty.EASY, wordlist)) <= 4
+
+    assert pick_word(6, 100, Difficulty.EASY, wordlist) == "abcdef"
+    assert pick_word(1, 2, Difficulty.EASY, wordlist) == "ab"
+
+    index = wordlist.index(Difficulty.EASY)
+    assert index.count(2, 6) == 5
+    assert index.count(4, 5) == 2
+    assert index.count(7, 10) == 0
+    assert index is wordlist.index(Difficulty.EASY)
+    assert index.histogram() == {2: 1, 3: 1, 4: 1, 5: 1, 6: 1}
+    assert (index.min_length, index.max_length) == (2, 6)
+
+
+def test_pick_word_difficulty_range():
+    wordlist = WordList(
+        easy=["ee", "tea", "see"], medium=["rat", "dog"],
+        hard=["jazz", "quiz", "zzz"])
+    index = wordlist.score_index()
+    assert index.count_band(2, 10, 0, 1) == 8
+    assert index is wordlist.score_index()
+
+    # the band spans all the tiers, regardless of the difficulty
+    for _ in range(20):
+        assert pick_word(2, 10, Difficulty.EASY, wordlist,
+                         difficulty_range=(0.75, 1)) in ("jazz", "zzz")
+        assert pick_word(2, 10, Difficulty.HARD, wordlist,
+                         difficulty_range=(0, 0.25)) in ("ee", "tea")
+    assert pick_word(3, 3, Difficulty.EASY, wordlist,
+                     difficulty_range=(0.75, 1)) == "zzz"
+
+    with pytest.raises(ValueError):
+        pick_word(4, 4, Difficulty.EASY, wordlist, difficulty_range=(0, 0.25))
+
+
+def test_update_game_bookkeeping():
+    state = State(target_word="banana", current_lives=3)
+    assert state.hidden == 6
+
+    update_game(state, Guess('a'))
+    assert state.hidden == 3
+    assert state.has_guessed(Guess('a'))
+    assert not state.has_guessed(Guess('n'))
+    assert state.guesses == [Guess('a')]
+
+    update_game(state, Guess('x'))
+    assert state.hidden == 3
+    assert state.current_lives == 2
+
+    update_game(state, Guess('n'))
+    assert state.is_running
+    assert not is_word_found(state)
+
+    update_game(state, Guess('b'))
+    assert state.hidden == 0
+    assert is_word_found(state)
+    assert not state.is_running
+    assert state.is_victory
+
+
+def test_state_guess_history():
+    state = State(target_word="penguin", current_lives=3,
+                  guesses=[Guess('p'), Guess('Z')])
+    update_game(state, Guess('penguix', whole_word=True))
+    update_game(state, Guess('e'))
+
+    assert state.guesses == [
+        Guess('p'), Guess('Z'),
+        Guess('penguix', whole_word=True),
+        Guess('e'),
+    ]
+    assert state.history == 'pZe'
+
+    # the list is rebuilt on access, guesses go through update_game
+    state.guesses.append(Guess('n'))
+    assert not state.has_guessed(Guess('n'))
+    assert state.has_guessed(Guess('Z'))
+    assert not state.has_guessed(Guess('z'))
+    assert state.has_guessed(Guess('penguix', whole_word=True))
+    assert not hasattr(state, '__dict__')
+    assert not hasattr(Guess('a'), '__dict__')
@@ -0,0 +1,64 @@
+import pytest
+from hangman.core import init_state, make_dealer
+from hangman.data import Configurations, Difficulty, WordList
+from hangman.dealer import WordDealer
+from hangman.index import LengthIndex
+
+WORDS = ["hi", "ace", "bed", "cat", "hello", "world", "penguin"]
+
+
+def test_deal_without_repeats():
+    dealer = WordDealer(LengthIndex(WORDS).select(3, 5), seed=1)
+    assert len(dealer) == 5
+
+    dealt = [dealer.deal() for _ in range(5)]
+    assert sorted(dealt) == ["ace", "bed", "cat", "hello", "world"]
+    assert dealer.remaining == 0
+
+    # a new round starts once every word was dealt
+    again = [dealer.deal() for _ in range(5)]
+    assert sorted(again) == sorted(dealt)
+    assert dealer.remaining == 0
+
+
+def test_no_repeat_across_rounds():
+    for size in (2, 3, 5):
+        for seed in range(50):
+            dealer = WordDealer(WORDS[:size], seed=seed)
+            dealt = [dealer.deal() for _ in range(size * 10)]
+            assert all(a != b for a, b in zip(dealt, dealt[1:]))
+            for i in range(0, len(dealt), size):
+                assert sorted(dealt[i:i + size]) == sorted(WORDS[:size])
+
+    # a single word can only be dealt again
+    dealer = WordDealer(["hi"], seed=0)
+    assert [dealer.deal() for _ in range(3)] == ["hi", "hi", "hi"]
+
+
+def test_deal_is_reproducible():
+    index = LengthIndex(WORDS)
+    first = WordDealer(index.select(2, 7), seed=42)
+    second = WordDealer(index.select(2, 7), seed=42)
+    assert [first.deal() for _ in range(20)] == \
+        [second.deal() for _ in range(20)]
+
+
+def test_deal_empty_range():
+    with pytest.raises(IndexError):
+        WordDealer(LengthIndex(WORDS).select(8, 10))
+
+
+def test_make_dealer(capsys: pytest.CaptureFixture):
+    wordlist = WordList(easy=[], medium=WORDS, hard=[])
+    config = Configurations(
+        lives=3, min_length=5, max_length=7,
+        difficulty=Difficulty.MEDIUM, seed=7)
+
+    dealer = make_dealer(config, wordlist)
+    words = {init_state(config, dealer=dealer).target_word for _ in range(3)}
+    assert words == {"hello", "world", "penguin"}
+    assert init_state(config, dealer=dealer).current_lives == 3
+
+    with pytest.raises(ValueError):
+        make_dealer(config, WordList(easy=[], medium=[], hard=[]))
+    assert "No word found" in capsys.readouterr().out
@@ -0,0 +1,61 @@
+import json
+import os
+import sys
+
+import pytest as pt
+
+pt.importorskip("numpy")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from classifier import TIERS, score_chunk  # noqa: E402
+from ingest import ingest, main, make_shards  # noqa: E402
+
+
+def test_make_shards(tmp_path):
+    path = tmp_path / "dictionary.txt"
+    data = b"".join(b"word%d\n" % i for i in range(100))
+    path.write_bytes(data)
+
+    shards = make_shards(str(path), shard_size=64)
+    assert len(shards) > 1
+    assert shards[0][1] == 0 and shards[-1][2] == len(data)
+    for (_, _, end), (_, start, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert data[end - 1:end] == b"\n"
+
+
+def test_ingest(tmp_path):
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text(
+        "cat\n  dog \nZebra\ncat\nﬁsh\nnaïve\nit's\n\nquiz\n" * 5,
+        encoding="utf-8")
+    second.write_text("dog\nowl\njazz\nfish\neel\n", encoding="utf-8")
+
+    tiers = ingest([str(first), str(second)], workers=2, shard_size=16)
+    words = [w for tier in tiers.values() for w in tier]
+    # normalized, filtered and deduplicated across shards and files
+    assert sorted(words) == sorted(
+        ["cat", "dog", "Zebra", "fish", "quiz", "owl", "jazz", "eel"])
+    assert all(tier == sorted(tier) for tier in tiers.values())
+
+    def score(word):
+        return score_chunk(f"{word}\n".encode("ascii"))[2][0]
+
+    # the tiers follow the scores: easier words never score higher
+    rank = {w: i for i, tier in enumerate(TIERS) for w in tiers[tier]}
+    by_score = sorted(words, key=score)
+    assert [rank[w] for w in by_score] == sorted(rank.values())
+    assert tiers["hard"] == ["Zebra", "jazz", "quiz"]
+
+
+def test_main_keeps_other_languages(tmp_path):
+    dictionary = tmp_path / "dictionary.txt"
+    dictionary.write_text("cat\ndog\nquiz\n")
+    output = tmp_path / "wordlists.json"
+    output.write_text('{"OTHER": {"easy": [], "medium": [], "hard": []}}')
+
+    main([str(dictionary), "--lang", "TEST", "-o", str(output), "-j", "1"])
+    data = json.loads(output.read_text())
+    assert set(data) == {"OTHER", "TEST"}
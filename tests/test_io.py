@@ -9,9 +9,11 @@ from typing import Any, Callable
 
 import pytest as pt
 from hangman.constants import ANIMATIONS, MAX_LIVES
-from hangman.core import Difficulty, Guess, State
+from hangman.core import Difficulty, Guess, State, update_game
+from hangman.data import Configurations, WordList
 from hangman.io import (display, get_guess, get_play_new_game, parse_args,
-                        print_error, print_info)
+                        parse_difficulty_range, print_error, print_info,
+                        validate_configuration)
 
 
 def check_error(capsys: pt.CaptureFixture, expected: str):
@@ -221,6 +223,33 @@ def test_get_guess(monkeypatch: pt.MonkeyPatch, capsys: pt.CaptureFixture):
     )
 
 
+def test_get_guess_hint(monkeypatch: pt.MonkeyPatch,
+                        capsys: pt.CaptureFixture):
+    def hint(state: State):
+        return next(
+            (c for c in "cat" if not state.has_guessed(Guess(c))), None)
+
+    state = State(target_word="cat", current_lives=3)
+    monkeypatch.setattr("sys.stdin", StringIO("?\nc\n"))
+    res = get_guess(state, hint)
+    assert res.guess == "c" and not res.whole_word
+    out = capsys.readouterr().out
+    assert "info: hint: try 'c'" in out
+    assert "error" not in out
+
+    update_game(state, Guess("c"))
+    update_game(state, Guess("a"))
+    update_game(state, Guess("t"))
+    monkeypatch.setattr("sys.stdin", StringIO("?\nx\n"))
+    get_guess(state, hint)
+    assert "no hint is available" in capsys.readouterr().out
+
+    # without hints, '?' is not a legal guess
+    monkeypatch.setattr("sys.stdin", StringIO("?\nx\n"))
+    get_guess(state)
+    assert "must be a valid ASCII" in capsys.readouterr().out
+
+
 def test_initial_display(capsys: pt.CaptureFixture):
     """
     Tests the display function at the start of a game
@@ -324,3 +353,92 @@ def test_get_play_new_game(
     monkeypatch.setattr('sys.stdin', StringIO("n"))
     res = get_play_new_game()
     assert not res
+
+
+def test_progress_display(capsys: pt.CaptureFixture):
+    """
+    Tests the display function while a game is running and some
+    characters have already been guessed.
+    """
+    state = State(target_word="penguin", current_lives=10,
+                  guesses=[Guess("n")], current_guess=None)
+    update_game(state, Guess("x"))
+    update_game(state, Guess("p"))
+    display(state)
+    captured = capsys.readouterr()
+    expected_output = [
+        "Word: p _ n _ _ _ n",
+        "Guess: p",
+        ANIMATIONS[1],
+        ""
+    ]
+    assert captured.out == "\n".join(expected_output)
+
+
+def test_parse_args_lang(capsys: pt.CaptureFixture):
+    """
+    Tests for the language argument in the parser.
+    """
+    res = parse_args(["--lang", "BRITISH"])
+    assert res.lang == "BRITISH"
+
+    with pt.raises(ValueError):
+        parse_args(["--lang", "KLINGON"])
+    check_error(capsys, "The language 'KLINGON' is not available.")
+
+
+def test_validate_configuration(capsys: pt.CaptureFixture):
+    """
+    Tests the validation of the configuration against the length
+    histogram of the wordlist.
+    """
+    wordlist = WordList(easy=["ab", "abc", "abcdef"], medium=[], hard=["a"])
+
+    assert validate_configuration(
+        Configurations(difficulty=Difficulty.EASY), wordlist) == 3
+    assert validate_configuration(Configurations(
+        min_length=3, max_length=6, difficulty=Difficulty.EASY
+    ), wordlist) == 2
+
+    with pt.raises(ValueError):
+        validate_configuration(Configurations(
+            min_length=4, max_length=5, difficulty=Difficulty.EASY
+        ), wordlist)
+    check_error(
+        capsys,
+        "There are no words between 4 and 5 characters in the game, "
+        "the 3 easy words are between 2 and 6 characters long.")
+
+    with pt.raises(ValueError):
+        validate_configuration(
+            Configurations(difficulty=Difficulty.MEDIUM), wordlist)
+    check_error(capsys, "There are no medium words in the game.")
+
+    with pt.raises(ValueError):
+        validate_configuration(
+            Configurations(difficulty=Difficulty.HARD), wordlist)
+    check_error(capsys, "The are no words as long as 2 in the game.")
+
+
+def test_parse_difficulty_range(capsys: pt.CaptureFixture):
+    assert parse_difficulty_range("0.8-0.95") == (0.8, 0.95)
+    assert parse_difficulty_range("0-1") == (0.0, 1.0)
+    for bad in ("0.95-0.8", "0.8", "a-b", "0.5-1.5"):
+        with pt.raises(ValueError):
+            parse_difficulty_range(bad)
+
+    with pt.raises(ValueError):
+        parse_args(["--difficulty-range", "0.9"])
+    assert "not a valid difficulty range" in capsys.readouterr().out
+
+    wordlist = WordList(easy=["ab", "abc"], medium=["jazz"], hard=["zzz"])
+    config = Configurations(min_length=3, difficulty_range=(0.5, 1))
+    assert validate_configuration(config, wordlist) == 2
+    with pt.raises(ValueError):
+        validate_configuration(
+            Configurations(min_length=4, difficulty_range=(0, 0.5)),
+            wordlist)
+    check_error(
+        capsys,
+        "There are no words between 4 and 2000 characters in the 0-0.5 "
+        "difficulty range.")
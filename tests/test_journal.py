@@ -0,0 +1,171 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import pytest as pt
+from hangman.core import update_game
+from hangman.data import Configurations, Guess, State, WordList
+from hangman.journal import (EVENT_END, EVENT_GUESS, EVENT_SESSION,
+                             EVENT_START, EVENT_WORD_GUESS, RECORD, Journal,
+                             iter_events, replay)
+from hangman.io import parse_args
+from hangman.server import Session
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def play(journal: Journal, word: str, guesses):
+    state = State(target_word=word, current_lives=3)
+    game = journal.start(state)
+    for guess in guesses:
+        update_game(state, guess)
+        journal.guess(game, state, guess)
+    if not state.is_running:
+        journal.end(game, state)
+    return state
+
+
+def test_journal_round_trip(tmp_path):
+    path = str(tmp_path / "games.journal")
+    long_word = "pneumonoultramicroscopicsilicovolcanoconiosis"
+
+    with Journal(path, flush_every=2) as journal:
+        won = play(
+            journal, "ace", [Guess("a"), Guess("x"), Guess("ace", True)])
+        lost = play(journal, long_word, [
+            Guess("z"), Guess(long_word[:-1] + "z", True), Guess("q")])
+        running = play(journal, "penguin", [Guess("p")])
+
+    # a second session appends to the same file
+    with Journal(path) as journal:
+        again = play(journal, "ace", [Guess("e")])
+
+    assert RECORD.size == 32
+    kinds = [event[1] for event in iter_events(path)]
+    assert kinds[:5] == [
+        EVENT_SESSION, EVENT_START, EVENT_GUESS, EVENT_GUESS,
+        EVENT_WORD_GUESS]
+    assert kinds.count(EVENT_END) == 2
+
+    states = replay(path)
+    assert states[(0, 0)] == won
+    assert states[(0, 1)] == lost
+    assert states[(0, 1)].target_word == long_word
+    assert states[(0, 2)] == running
+    assert states[(1, 0)] == again
+
+
+def test_replay_non_ascii(tmp_path):
+    path = str(tmp_path / "games.journal")
+    with Journal(path) as journal:
+        played = play(journal, "déjà", [
+            Guess("é"), Guess("a"), Guess("dajà", True), Guess("à"),
+            Guess("j"), Guess("d")])
+
+    states = replay(path)
+    assert len(states) == 1
+    assert states[(0, 0)] == played
+    assert states[(0, 0)].is_victory
+    # built once, on the first look up
+    assert states[(0, 0)] is states[(0, 0)]
+
+
+def test_replay_truncated_and_corrupt(tmp_path):
+    path = tmp_path / "games.journal"
+    with Journal(str(path)) as journal:
+        play(journal, "ace", [Guess("a")])
+
+    # a crash in the middle of a record
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 10)
+    assert replay(str(path))[(0, 0)].revealed == ["a", "_", "_"]
+
+    data = bytearray(path.read_bytes())
+    # lives of the guess record
+    data[2 * RECORD.size + 5] = 1
+    path.write_bytes(bytes(data))
+    with pt.raises(ValueError):
+        replay(str(path))
+
+
+def test_server_session_journal(tmp_path):
+    path = str(tmp_path / "games.journal")
+    wordlist = WordList(easy=[], medium=["ace"], hard=[])
+    with Journal(path) as journal:
+        session = Session(Configurations(lives=2), wordlist, journal)
+        session.handle("GUESS a")
+        session.handle("GUESS ace")
+        session.handle("NEW")
+        session.handle("GUESS x")
+
+    states = replay(path)
+    assert states[(0, 0)].is_victory
+    assert states[(0, 1)].current_lives == 1
+
+
+def test_journal_flushes_without_close(tmp_path):
+    path = tmp_path / "games.journal"
+    journal = Journal(str(path), flush_interval=0.05)
+    try:
+        # the session record does not wait for the first flush
+        assert path.stat().st_size == RECORD.size
+        play(journal, "ace", [Guess("a")])
+        deadline = time.monotonic() + 5
+        while path.stat().st_size < 3 * RECORD.size:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert replay(str(path))[(0, 0)].revealed == ["a", "_", "_"]
+    finally:
+        journal.close()
+
+
+@pt.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs unix sockets")
+def test_server_terminated_closes_journal(tmp_path):
+    address = str(tmp_path / "hangman.sock")
+    path = str(tmp_path / "games.journal")
+    server = subprocess.Popen(
+        [sys.executable, "main.py", "-d", "easy",
+         "--serve", f"unix:{address}", "--journal", path],
+        cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        deadline = time.monotonic() + 10
+        while not os.path.exists(address):
+            assert time.monotonic() < deadline and server.poll() is None
+            time.sleep(0.05)
+
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(address)
+            replies = client.makefile("rw")
+            assert replies.readline().startswith("NEW ")
+            replies.write("GUESS zz\n")
+            replies.flush()
+            assert replies.readline().startswith("ERROR")
+            replies.write("GUESS e\n")
+            replies.flush()
+            assert replies.readline().startswith(("STATE", "WON", "LOST"))
+
+            server.send_signal(signal.SIGTERM)
+            assert server.wait(timeout=10) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+
+    states = replay(path)
+    assert list(states) == [(0, 0)]
+    assert states[(0, 0)].has_guessed(Guess("e"))
+
+
+def test_parse_args_journal(tmp_path, capsys: pt.CaptureFixture):
+    with pt.raises(ValueError):
+        parse_args(["--journal", str(tmp_path / "missing" / "games")])
+    assert "cannot open the journal" in capsys.readouterr().out
+
+    with pt.raises(ValueError):
+        parse_args(["--journal", str(tmp_path / "games"), "--batch", "-"])
+    assert "cannot be journaled" in capsys.readouterr().out
+
+    path = str(tmp_path / "games")
+    assert parse_args(["--journal", path, "--serve"]).journal == path
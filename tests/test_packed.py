@@ -0,0 +1,158 @@
+import gc
+import importlib.util
+import json
+import os
+import sys
+
+import pytest
+from hangman.data import Difficulty, WordList
+from hangman.index import word_score
+from hangman.io import load_wordlist
+from hangman.packed import (EMBEDDED_MODULE, PackedTier, compile_wordlists,
+                            load_packed_wordlist, load_shard, pack_wordlists,
+                            read_languages, read_manifest)
+
+
+def test_pack_round_trip():
+    wordlist = WordList(
+        easy=["ace", "hello", "hi", "world"],
+        medium=["penguin"],
+        hard=[],
+    )
+    packed = read_languages(pack_wordlists({"TEST": wordlist}))["TEST"]
+
+    # words are grouped by length, in their original order otherwise
+    assert list(packed.easy) == ["hi", "ace", "hello", "world"]
+    assert list(packed.medium) == ["penguin"]
+    assert list(packed.hard) == []
+    assert packed.easy[-1] == "world"
+    assert packed.easy[1:3] == ["ace", "hello"]
+    with pytest.raises(IndexError):
+        packed.easy[4]
+
+    index = packed.index(Difficulty.EASY)
+    assert index.count(3, 5) == 3
+    assert index.count(6, 10) == 0
+
+
+def test_pack_scores():
+    wordlist = WordList(easy=["hi", "jazz"], medium=["ace"], hard=[])
+    packed = read_languages(pack_wordlists({"TEST": wordlist}))["TEST"]
+    assert list(packed.easy.scores()) == pytest.approx(
+        [word_score("hi"), word_score("jazz")])
+    assert packed.score_index().count_band(2, 4, 0, 1) == 3
+
+    # version 1 files have no scores, they are computed instead
+    v1 = b"HMWL\x01\x00\x01\x00TEST" + b"\x00" * 12 + b"\x00" * 24
+    old = read_languages(v1)["TEST"]
+    assert old.easy.scores() is None
+    assert len(old.score_index()) == 0
+
+
+def test_pack_non_ascii():
+    with pytest.raises(ValueError):
+        pack_wordlists(
+            {"TEST": WordList(easy=["café"], medium=[], hard=[])})
+
+
+def test_compile_wordlists(tmp_path):
+    src = tmp_path / "wordlists.json"
+    dst = tmp_path / "wordlists.bin"
+    src.write_text(
+        '{"A": {"easy": ["one"], "medium": ["three"], "hard": ["eleven"]},'
+        ' "B": {"easy": ["uno"], "medium": ["tres"], "hard": ["once"]}}')
+    compile_wordlists(str(src), str(dst))
+
+    wordlist = load_packed_wordlist(str(dst), "B")
+    assert list(wordlist.easy) == ["uno"]
+    assert list(wordlist.medium) == ["tres"]
+    assert list(wordlist.hard) == ["once"]
+
+    with pytest.raises(ValueError):
+        read_languages(b"XXXX\x01\x00\x00\x00")
+
+
+def test_shards(tmp_path):
+    src = tmp_path / "wordlists.json"
+    src.write_text(
+        '{"A": {"easy": ["one"], "medium": ["three"], "hard": ["eleven"]},'
+        ' "B": {"easy": ["uno"], "medium": ["tres"], "hard": ["once"]}}')
+    directory = tmp_path / "wordlists"
+    compile_wordlists(str(src), str(directory), split=True)
+
+    manifest = read_manifest(str(directory))
+    assert manifest["languages"]["B"]["medium"] == {
+        "path": "B/medium.bin", "count": 1}
+
+    assert list(load_shard(str(directory), "B", "medium")) == ["tres"]
+    assert list(load_shard(str(directory), "A", "hard")) == ["eleven"]
+    with pytest.raises(KeyError):
+        load_shard(str(directory), "C", "easy")
+
+
+def test_load_wordlist_prefers_shards(tmp_path):
+    src = tmp_path / "wordlists.json"
+    src.write_text(
+        '{"A": {"easy": ["one"], "medium": ["three"], "hard": ["eleven"]}}')
+    compile_wordlists(str(src), str(tmp_path / "wordlists"), split=True)
+
+    wordlist = load_wordlist(str(src), "A")
+    assert isinstance(wordlist.medium.resolve(), PackedTier)
+    assert list(wordlist.medium) == ["three"]
+    # the other tiers are not opened
+    assert not wordlist.easy.is_loaded
+    assert not wordlist.hard.is_loaded
+
+
+def test_embedded_wordlists(tmp_path, monkeypatch):
+    src = tmp_path / "wordlists.json"
+    src.write_text(
+        '{"A": {"easy": ["one"], "medium": ["three"], "hard": ["eleven"]}}')
+    module_path = tmp_path / "_wordlists_data.py"
+    compile_wordlists(str(src), str(module_path), embed=True)
+
+    spec = importlib.util.spec_from_file_location(
+        EMBEDDED_MODULE, str(module_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setitem(sys.modules, EMBEDDED_MODULE, module)
+
+    assert list(read_languages(module.DATA)["A"].hard) == ["eleven"]
+    # without any asset on disk, the embedded wordlists are used
+    wordlist = load_wordlist(str(tmp_path / "missing.json"), "A")
+    assert list(wordlist.medium) == ["three"]
+
+
+def test_missing_wordlist(tmp_path, monkeypatch):
+    # a `None` entry makes the import of the embedded module fail
+    monkeypatch.setitem(sys.modules, EMBEDDED_MODULE, None)
+    wordlist = load_wordlist(str(tmp_path / "missing.json"), "A")
+    with pytest.raises(FileNotFoundError, match="not embedded"):
+        list(wordlist.easy)
+
+
+def test_json_parsed_once(tmp_path, monkeypatch):
+    src = tmp_path / "wordlists.json"
+    src.write_text(
+        '{"A": {"easy": ["one"], "medium": ["three"], "hard": ["eleven"]}}')
+    loads = []
+    load = json.load
+    monkeypatch.setattr(
+        "hangman.io.json.load", lambda f: loads.append(f) or load(f))
+
+    # a percentile band reads all the tiers
+    wordlist = load_wordlist(str(src), "A")
+    assert sorted(wordlist.score_index()) == ["eleven", "one", "three"]
+    assert list(wordlist.medium) == ["three"]
+    assert len(loads) == 1
+
+    # a single tier keeps none of the others
+    src.write_text(
+        '{"A": {"easy": ["two"], "medium": ["four"], "hard": ["nine"]}}')
+    os.utime(src, (0, 1))
+    wordlist = load_wordlist(str(src), "A")
+    assert list(wordlist.medium) == ["four"]
+    assert len(loads) == 2
+    assert not wordlist.easy.is_loaded and not wordlist.hard.is_loaded
+    alive = [o for o in gc.get_objects() if type(o) is list]
+    assert ["nine"] not in alive
@@ -0,0 +1,94 @@
+import random
+import sys
+
+import pytest
+from hangman.core import make_hint, update_game
+from hangman.data import Configurations, Difficulty, Guess, State, WordList
+from hangman.index import LengthIndex
+from hangman.patterns import PatternIndex, missed_letters
+
+WORDS = ["banana", "bandit", "cabana", "canvas", "sultan", "tartan",
+         "ace", "bee", "cat", "panama"]
+
+
+def brute_force(pattern: str, missed: str):
+    shown = set(pattern) - {"_"}
+    return sorted(
+        w for w in WORDS
+        if len(w) == len(pattern)
+        and all(p in ("_", c) for p, c in zip(pattern, w))
+        and not any(c in missed for c in w)
+        and not any(p == "_" and c in shown for p, c in zip(pattern, w))
+    )
+
+
+@pytest.mark.parametrize("pattern, missed", [
+    ("______", ""),
+    ("_a_a__", ""),
+    ("_a_a_a", ""),
+    ("_a_a__", "n"),
+    ("__n___", "e"),
+    ("______", "aeiou"),
+    ("___", "x"),
+    ("____", ""),
+])
+def test_matches(pattern: str, missed: str):
+    index = PatternIndex(LengthIndex(WORDS))
+    mask = index.matches(pattern, missed)
+    assert sorted(index.words(len(pattern), mask)) == \
+        brute_force(pattern, missed)
+    assert index.count(pattern, missed) == len(brute_force(pattern, missed))
+
+
+def test_state_matches():
+    index = PatternIndex(LengthIndex(WORDS))
+    state = State(target_word="cabana", current_lives=5)
+    update_game(state, Guess("a"))
+    update_game(state, Guess("t"))
+    assert missed_letters(state) == ["t"]
+
+    mask = index.state_matches(state)
+    assert sorted(index.words(6, mask)) == ["banana", "cabana", "panama"]
+    assert index.letter_counts(6, mask) == {
+        "a": 3, "b": 2, "c": 1, "m": 1, "n": 3, "p": 1}
+
+    rng = random.Random(3)
+    picked = {index.pick(state.revealed, ["t"], rng) for _ in range(30)}
+    assert picked == {"banana", "cabana", "panama"}
+    with pytest.raises(IndexError):
+        index.pick("_a_a_x")
+
+
+def test_best_letter():
+    index = PatternIndex(LengthIndex(WORDS))
+    state = State(target_word="cabana", current_lives=5)
+    # 'a' and 'n' are in all the 6 letter words, 'a' occurs more often
+    assert index.best_letter(state) == "a"
+
+    update_game(state, Guess("a"))
+    update_game(state, Guess("t"))
+    assert index.best_letter(state) == "n"
+
+    update_game(state, Guess("banana", whole_word=True))
+    update_game(state, Guess("n"))
+    # 'cabana' is left, as 'banana' was guessed already and 'panama'
+    # would show its 'n'; the first letter is suggested on ties
+    assert index.best_letter(state) == "b"
+
+    for letter in "bc":
+        update_game(state, Guess(letter))
+    assert not state.is_running
+    assert index.best_letter(state) is None
+
+
+def test_make_hint_without_numpy(monkeypatch: pytest.MonkeyPatch):
+    # importing the solver fails as if numpy were not installed
+    monkeypatch.setitem(sys.modules, "hangman.solver", None)
+    wordlist = WordList(easy=[], medium=WORDS, hard=[])
+    hint = make_hint(Configurations(difficulty=Difficulty.MEDIUM), wordlist)
+    state = State(target_word="cabana", current_lives=5)
+    hint.prepare(state)
+    assert isinstance(hint.solver(), PatternIndex)
+    assert hint(state) == "a"
+    update_game(state, Guess("a"))
+    assert hint(state) == "n"
@@ -0,0 +1,62 @@
+import pytest as pt
+from hangman import profiling
+
+
+@pt.fixture(autouse=True)
+def clean_profiling():
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+def test_histogram_percentiles():
+    histogram = profiling.Histogram()
+    for ms in range(1, 101):
+        histogram.add(ms / 1000, 0.0)
+    assert histogram.count == 100
+    assert histogram.wall == pt.approx(5.05)
+    # buckets are within ~9% of the real value
+    assert 0.050 <= histogram.percentile(0.50) <= 0.050 * 1.1
+    assert 0.095 <= histogram.percentile(0.95) <= 0.095 * 1.1
+    assert 0.099 <= histogram.percentile(0.99) <= 0.099 * 1.1
+    assert profiling.Histogram().percentile(0.5) == 0.0
+
+
+def test_profiled_records_only_when_enabled():
+    calls = []
+
+    @profiling.profiled('double')
+    def double(x):
+        return 2 * x
+
+    profiling.add_hook(lambda name, wall, cpu: calls.append(name))
+    try:
+        assert double(2) == 4
+        assert profiling.phases() == {}
+
+        profiling.enable()
+        assert double(3) == 6
+        with profiling.phase('block'):
+            double(4)
+        profiling.disable()
+        double(5)
+    finally:
+        profiling._hooks.clear()
+
+    phases = profiling.phases()
+    assert phases['double'].count == 2
+    assert phases['block'].count == 1
+    assert calls == ['double', 'double', 'block']
+    assert 'double' in profiling.report()
+
+
+def test_enable_modes():
+    with pt.raises(ValueError):
+        profiling.enable('perf')
+
+    profiling.enable('tracemalloc')
+    assert 'memory:' in profiling.report()
+    profiling.reset()
+
+    profiling.enable('cprofile')
+    assert 'function calls' in profiling.report()
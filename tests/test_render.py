@@ -0,0 +1,68 @@
+from io import StringIO
+from typing import List
+
+import pytest
+from hangman.core import update_game
+from hangman.data import Guess, State
+from hangman.render import Renderer
+
+
+class RecordingOutput(StringIO):
+    """
+    Keeps every write apart, to count them.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.writes: List[str] = []
+
+    def write(self, s: str) -> int:
+        self.writes.append(s)
+        return super().write(s)
+
+
+@pytest.fixture(autouse=True)
+def terminal_size(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv('COLUMNS', '80')
+    monkeypatch.setenv('LINES', '40')
+
+
+def test_plain_draw_is_a_single_write():
+    out = RecordingOutput()
+    renderer = Renderer(out, ansi=False)
+    state = State(target_word="penguin", current_lives=10)
+    renderer.draw(state)
+    renderer.draw(state)
+
+    assert len(out.writes) == 2
+    assert out.writes[0] == out.writes[1] == renderer.render(state)
+    assert "\x1b" not in out.getvalue()
+
+
+def test_ansi_redraws_changed_lines():
+    out = RecordingOutput()
+    renderer = Renderer(out, ansi=True)
+    state = State(target_word="penguin", current_lives=10,
+                  guesses=[Guess("n")], current_guess=Guess("n"))
+
+    renderer.draw(state)
+    assert out.writes[0].startswith("\x1b[H\x1b[2J")
+
+    # nothing changed, nothing is written
+    renderer.draw(state)
+    assert len(out.writes) == 1
+
+    # a right guess only changes the word and the guess lines
+    update_game(state, Guess("p"))
+    renderer.draw(state)
+    assert len(out.writes) == 2
+    update = out.writes[1]
+    assert update.count("\x1b[K") == 2
+    assert "Word: p _ n _ _ _ n" in update
+    assert "Guess: p" in update
+    # the prompts below the screen are cleared
+    assert update.endswith("\x1b[J")
+
+    renderer.reset()
+    renderer.draw(state)
+    assert out.writes[2].startswith("\x1b[H\x1b[2J")
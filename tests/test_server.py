@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest as pt
+from hangman.data import Configurations, Difficulty, WordList
+from hangman.io import parse_address
+from hangman.server import Session, start_server
+
+WORDLIST = WordList(easy=["ace"], medium=["penguin"], hard=["hard"])
+
+
+def test_parse_address():
+    assert parse_address("localhost:80") == ("localhost", 80)
+    assert parse_address(":80") == ("127.0.0.1", 80)
+    assert parse_address("unix:/tmp/hangman.sock") == "/tmp/hangman.sock"
+    with pt.raises(ValueError):
+        parse_address("localhost")
+    with pt.raises(ValueError):
+        parse_address("localhost:99999")
+    with pt.raises(ValueError):
+        parse_address("unix:")
+
+
+def test_session():
+    session = Session(Configurations(lives=2), WORDLIST)
+    assert session.greeting() == "NEW 7 2"
+    assert session.handle("GUESS p\n") == "STATE p______ 2"
+    assert session.handle("GUESS p") == "ERROR you already input this"
+    assert session.handle("GUESS pen").startswith("ERROR")
+    assert session.handle("NEW") == "ERROR the current game is not over"
+    assert session.handle("GUESS x") == "STATE p______ 1"
+    assert session.handle("GUESS penguix") == "LOST penguin 0"
+    assert session.handle("GUESS a").startswith("ERROR")
+    assert session.handle("NEW") == "NEW 7 2"
+    assert session.handle("GUESS PENGUIN") == "WON penguin 2"
+    assert session.handle("penguin").startswith("ERROR unknown command")
+
+
+def test_words_named_like_commands():
+    wordlist = WordList(easy=["new"], medium=["quit"], hard=[])
+    session = Session(Configurations(difficulty=Difficulty.EASY), wordlist)
+    assert session.handle("guess new") == "WON new 10"
+    session = Session(Configurations(), wordlist)
+    assert session.handle("GUESS quit") == "WON quit 10"
+
+
+def test_server_sessions():
+    config = Configurations(difficulty=Difficulty.EASY, serve="127.0.0.1:0")
+
+    async def play(port, guesses):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        replies = [(await reader.readline()).decode().strip()]
+        for guess in guesses:
+            writer.write(f"GUESS {guess}\n".encode())
+            replies.append((await reader.readline()).decode().strip())
+        writer.write(b"QUIT\n")
+        await writer.drain()
+        assert await reader.read() == b""
+        writer.close()
+        return replies
+
+    async def scenario():
+        server = await start_server(config, WORDLIST)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await asyncio.gather(
+                play(port, ["a", "c", "e"]),
+                play(port, ["x", "ace"]),
+            )
+
+    first, second = asyncio.run(scenario())
+    assert first == ["NEW 3 10", "STATE a__ 10", "STATE ac_ 10",
+                     "WON ace 10"]
+    assert second == ["NEW 3 10", "STATE ___ 9", "WON ace 9"]
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+from hangman.data import Configurations, Difficulty, State
+from hangman.simulate import (frequency_strategy, length_band,
+                              make_strategy, play, random_strategy, simulate)
+
+
+def test_strategies_do_not_repeat():
+    rng = random.Random(0)
+    for strategy in (random_strategy, frequency_strategy):
+        state = State(target_word="qqqqqqqqqqqqqqqqqqqqqqqqqqq",
+                      current_lives=26)
+        seen = set()
+        for _ in range(25):
+            guess = strategy(state, rng)
+            assert guess.guess not in seen
+            seen.add(guess.guess)
+            state.add_guess(guess)
+        assert len(seen) == 25
+
+
+def test_length_band():
+    assert length_band(2) == 4
+    assert length_band(4) == 4
+    assert length_band(5) == 7
+    assert length_band(11) == length_band(2000)
+
+
+def test_play():
+    state, n_guesses = play(
+        Configurations(lives=10), frequency_strategy, random.Random(1))
+    assert not state.is_running
+    assert n_guesses >= 1
+    assert n_guesses == len(state.guesses)
+
+
+def test_simulate():
+    results = simulate(
+        50, 'random', [Difficulty.EASY, Difficulty.HARD],
+        workers=2, seed=3, chunk_size=20)
+    for difficulty in (Difficulty.EASY, Difficulty.HARD):
+        outcomes = results[difficulty].values()
+        assert sum(o.games for o in outcomes) == 50
+        assert all(0 <= o.wins <= o.games for o in outcomes)
+
+    again = simulate(
+        50, 'random', [Difficulty.EASY, Difficulty.HARD],
+        workers=2, seed=3, chunk_size=20)
+    assert {
+        d: {b: (o.games, o.wins, o.guesses) for b, o in r.items()}
+        for d, r in results.items()
+    } == {
+        d: {b: (o.games, o.wins, o.guesses) for b, o in r.items()}
+        for d, r in again.items()
+    }
+
+
+def test_solver_strategy():
+    pytest.importorskip("numpy")
+    config = Configurations(lives=10, difficulty=Difficulty.EASY)
+    wins = {}
+    for name in ('frequency', 'solver'):
+        strategy = make_strategy(name, config)
+        rng = random.Random(2)
+        wins[name] = sum(
+            play(config, strategy, rng)[0].is_victory for _ in range(50))
+    # the solver only guesses letters of words that can still match
+    assert wins['solver'] > wins['frequency']
+
+    with pytest.raises(ValueError):
+        make_strategy('psychic', config)
@@ -0,0 +1,106 @@
+import pytest as pt
+from hangman.core import make_hint, update_game
+from hangman.data import Configurations, Difficulty, Guess, State, WordList
+from hangman.index import LengthIndex
+
+pt.importorskip("numpy")
+
+from hangman.solver import Solver  # noqa: E402
+
+WORDLIST = WordList(
+    easy=[],
+    medium=["cat", "cot", "cut", "dog", "tea", "heat", "meat"],
+    hard=[],
+)
+
+
+def test_candidates():
+    solver = Solver(WORDLIST.index(Difficulty.MEDIUM))
+    state = State(target_word="cat", current_lives=5)
+    assert solver.candidate_words(state) == [
+        "cat", "cot", "cut", "dog", "tea"]
+
+    update_game(state, Guess("t"))
+    assert solver.candidate_words(state) == ["cat", "cot", "cut"]
+
+    update_game(state, Guess("o"))
+    assert solver.candidate_words(state) == ["cat", "cut"]
+
+    update_game(state, Guess("cut", whole_word=True))
+    assert solver.candidate_words(state) == ["cat"]
+
+
+def test_repeated_letters_are_fully_revealed():
+    solver = Solver(WordList(
+        easy=[], medium=["tot", "top", "pot"], hard=[]
+    ).index(Difficulty.MEDIUM))
+    state = State(target_word="top", current_lives=5)
+    update_game(state, Guess("t"))
+    # 'tot' would have revealed both its t's
+    assert solver.candidate_words(state) == ["top"]
+
+
+def test_best_letter():
+    solver = Solver(WORDLIST.index(Difficulty.MEDIUM))
+    state = State(target_word="meat", current_lives=5)
+    assert solver.best_letter(state) in "eat"
+
+    for c in "eat":
+        update_game(state, Guess(c))
+    assert solver.best_letter(state) in "hm"
+
+    update_game(state, Guess("h"))
+    assert solver.best_letter(state) == "m"
+
+    update_game(state, Guess("m"))
+    assert solver.best_letter(state) is None
+
+
+def test_hints_follow_the_game():
+    words = ["banana", "bandit", "cabana", "canvas", "sultan", "tartan",
+             "ace", "bee", "cat", "panama"]
+    solver = Solver(LengthIndex(words))
+    state = State(target_word="cabana", current_lives=5)
+    hints = solver.hints(state)
+    # 'a' and 'n' are in all the 6 letter words, 'a' occurs more often
+    assert solver.best_letter(state) == "a"
+
+    update_game(state, Guess("a"))
+    update_game(state, Guess("t"))
+    # the candidates are narrowed with the new guesses only
+    assert solver.hints(state) is hints
+    assert solver.candidate_words(state) == \
+        Solver(LengthIndex(words)).candidate_words(state)
+    assert solver.best_letter(state) == "n"
+
+    for letter in "nbc":
+        update_game(state, Guess(letter))
+    assert not state.is_running
+    assert solver.best_letter(state) is None
+
+    other = State(target_word="cabana", current_lives=5)
+    assert solver.hints(other) is not hints
+    assert solver.best_letter(other) == "a"
+
+
+def test_make_hint():
+    hint = make_hint(Configurations(difficulty=Difficulty.MEDIUM), WORDLIST)
+    state = State(target_word="heat", current_lives=5)
+    # the tables are built when the game starts, not on the first hint
+    hint.prepare(state)
+    solver = hint.solver()
+    assert isinstance(solver, Solver)
+    assert 4 in solver._tables
+    for c in "eat":
+        update_game(state, Guess(c))
+    assert hint(state) in "hm"
+    update_game(state, Guess("h"))
+    assert hint(state) is None
+
+    # picking by percentile, the hints cover all the tiers
+    config = Configurations(difficulty_range=(0, 1))
+    hint = make_hint(config, WordList(easy=["fox"], medium=["box"], hard=[]))
+    state = State(target_word="box", current_lives=5)
+    update_game(state, Guess("o"))
+    update_game(state, Guess("x"))
+    assert hint(state) in "bf"
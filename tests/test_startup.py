@@ -0,0 +1,74 @@
+'''
+Guards the startup path of the game: importing the game modules or
+printing the help message must not read the wordlist.
+'''
+import io
+import os
+import subprocess
+import sys
+import time
+
+from hangman.data import Configurations, Difficulty
+from hangman.io import load_wordlist
+from hangman.render import Renderer
+from main import play_games
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# NOTE(andrea): generous on purpose, CI machines are slow. Loading the
+# JSON wordlist alone takes a good fraction of this.
+IMPORT_BUDGET = 0.5
+
+PROBE = '''
+import builtins
+opened = []
+_open = builtins.open
+def tracking_open(file, *args, **kwargs):
+    opened.append(str(file))
+    return _open(file, *args, **kwargs)
+builtins.open = tracking_open
+
+import main
+import hangman.core
+import hangman.io
+print([f for f in opened if 'wordlists' in f])
+'''
+
+
+def test_import_does_not_load_wordlist():
+    out = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_help_startup_budget():
+    start = time.perf_counter()
+    out = subprocess.run(
+        [sys.executable, 'main.py', '--help'],
+        cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    assert out.returncode == 0
+    assert "usage" in out.stdout
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_startup_reports_available_words():
+    out = subprocess.run(
+        [sys.executable, 'main.py', '-d', 'easy', '-m', '3', '-M', '3'],
+        cwd=ROOT, input='', capture_output=True, text=True)
+    available = load_wordlist().index(Difficulty.EASY).count(3, 3)
+    message = f"info: {available} words can be picked with this configuration"
+    # shown once, below the first screen
+    assert out.stdout.count(message) == 1
+    assert out.stdout.index("Word: _ _ _") < out.stdout.index(message)
+
+
+def test_available_words_survive_the_first_draw(monkeypatch, capsys):
+    monkeypatch.setattr("hangman.io._renderer", Renderer(ansi=True))
+    monkeypatch.setattr("sys.stdin", io.StringIO(""))
+    play_games(Configurations(difficulty=Difficulty.EASY, min_length=3,
+                              max_length=3, seed=0))
+    out = capsys.readouterr().out
+    # nothing printed before the screen is cleared is kept
+    assert "words can be picked" in out.split("\x1b[2J")[-1]
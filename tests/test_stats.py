@@ -0,0 +1,121 @@
+import sqlite3
+
+import pytest
+from hangman.data import Configurations, Difficulty, Guess, State
+from hangman.io import parse_args
+from hangman.stats import (StatsStore, connect, difficulty_win_rates,
+                           hardest_words, report, word_win_rate)
+
+
+def finished(word: str, victory: bool) -> State:
+    state = State(target_word=word, current_lives=3 if victory else 0,
+                  guesses=[Guess("x"), Guess("e")])
+    state.is_running = False
+    state.is_victory = victory
+    return state
+
+
+def test_store_records_games(tmp_path):
+    path = str(tmp_path / "stats.db")
+    with StatsStore(path, batch_size=2) as store:
+        store.record(finished("penguin", True), "easy", "B", 1.5)
+        store.record(finished("penguin", False), "easy", "B", 2.5)
+        store.record(finished("otter", False), "hard", "B", 3.0)
+
+    connection = connect(path)
+    assert connection.execute('PRAGMA journal_mode').fetchone() == ('wal',)
+    assert word_win_rate(connection, "penguin") == (2, 1)
+    assert word_win_rate(connection, "walrus") == (0, 0)
+    assert difficulty_win_rates(connection) == [
+        ("easy", 2, 1, 2.0, 2.0),
+        ("hard", 1, 0, 2.0, 3.0),
+    ]
+    assert hardest_words(connection, min_games=1) == [
+        ("otter", 1, 0), ("penguin", 2, 1)]
+    assert connection.execute(
+        'SELECT guesses FROM games LIMIT 1').fetchone() == ("x e",)
+
+    # the queries are served by the indexes
+    plan = connection.execute(
+        'EXPLAIN QUERY PLAN SELECT count(*), sum(victory) FROM games '
+        'WHERE word = ?', ("penguin",)).fetchall()
+    assert "games_by_word" in str(plan)
+    connection.close()
+
+    out = report(path)
+    assert "easy" in out and "50.0%" in out
+    assert "penguin" in out
+
+
+def test_difficulty_label():
+    # games picked by percentile are recorded with their band
+    config = Configurations(difficulty=Difficulty.HARD)
+    assert config.difficulty_label == "hard"
+    config = Configurations(
+        difficulty=Difficulty.HARD, difficulty_range=(0.8, 0.95))
+    assert config.difficulty_label == "0.8-0.95"
+    assert Configurations(difficulty_range=(0, 1)).difficulty_label == "0-1"
+
+
+def test_report_leaves_the_database_untouched(tmp_path):
+    path = tmp_path / "stats.db"
+    connection = sqlite3.connect(str(path))
+    connection.execute(
+        "CREATE TABLE games (id INTEGER PRIMARY KEY, played_at REAL, "
+        "lang TEXT, difficulty TEXT, word TEXT, victory INTEGER, "
+        "lives INTEGER, n_guesses INTEGER, guesses TEXT, duration REAL)")
+    with connection:
+        connection.execute(
+            "INSERT INTO games VALUES "
+            "(1, 0, 'B', 'easy', 'otter', 1, 3, 4, 'o t e r', 2.0)")
+    connection.close()
+    before = path.read_bytes()
+
+    assert parse_args(["--stats", str(path)]).stats == str(path)
+    assert "easy" in report(str(path))
+    assert path.read_bytes() == before
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["stats.db"]
+
+
+def test_store_bad_path(tmp_path):
+    with pytest.raises(sqlite3.OperationalError):
+        StatsStore(str(tmp_path / "missing" / "stats.db"))
+
+
+def test_parse_args_stats(tmp_path, capsys: pytest.CaptureFixture):
+    path = tmp_path / "stats.db"
+    with pytest.raises(ValueError):
+        parse_args(["--stats", str(path)])
+    assert "does not exist" in capsys.readouterr().out
+
+    connect(str(path)).close()
+    assert parse_args(["--stats", str(path)]).stats == str(path)
+    assert parse_args(["--record", str(path)]).record == str(path)
+
+
+def test_parse_args_bad_databases(tmp_path, capsys: pytest.CaptureFixture):
+    with pytest.raises(ValueError):
+        parse_args(["--record", str(tmp_path / "missing" / "stats.db")])
+    assert "not a usable stats database" in capsys.readouterr().out
+
+    # the database is checked before being reported, and left untouched
+    text = tmp_path / "notes.txt"
+    text.write_text("not a database")
+    with pytest.raises(ValueError):
+        parse_args(["--stats", str(text)])
+    assert "not a usable stats database" in capsys.readouterr().out
+    empty = tmp_path / "empty.db"
+    sqlite3.connect(str(empty)).close()
+    with pytest.raises(ValueError):
+        parse_args(["--stats", str(empty)])
+    assert text.read_text() == "not a database"
+
+
+def test_parse_args_record_local_games_only(
+    tmp_path, capsys: pytest.CaptureFixture
+):
+    path = str(tmp_path / "stats.db")
+    for mode in (["--serve"], ["--batch", "-"]):
+        with pytest.raises(ValueError):
+            parse_args(["--record", path] + mode)
+        assert "only local games" in capsys.readouterr().out
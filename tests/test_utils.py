@@ -0,0 +1,101 @@
+import threading
+
+from hangman.utils import cached, file_stamp
+
+
+def test_cached_hits_and_misses():
+    calls = []
+
+    @cached
+    def square(x, y=1):
+        calls.append(x)
+        return x * x * y
+
+    assert square(2) == 4
+    assert square(2) == 4
+    # default arguments do not create a different entry
+    assert square(2, 1) == 4
+    assert square(x=2) == 4
+    assert square(3) == 9
+    assert calls == [2, 3]
+
+    info = square.cache_info()
+    assert info.hits == 3
+    assert info.misses == 2
+    assert info.currsize == 2
+
+    square.cache_clear()
+    assert square.cache_info().currsize == 0
+    assert square(2) == 4
+    assert calls == [2, 3, 2]
+
+
+def test_cached_lru_eviction():
+    calls = []
+
+    @cached(maxsize=2)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(1)
+    identity(2)
+    identity(1)  # 2 is now the least recently used
+    identity(3)
+    identity(1)
+    identity(2)
+    assert calls == [1, 2, 3, 2]
+    assert identity.cache_info().currsize == 2
+
+
+def test_cached_ttl():
+    calls = []
+
+    @cached(ttl=0)
+    def identity(x):
+        calls.append(x)
+        return x
+
+    identity(1)
+    identity(1)
+    assert calls == [1, 1]
+
+
+def test_cached_stamp(tmp_path):
+    path = tmp_path / "asset.txt"
+    path.write_text("one")
+
+    @cached(stamp=lambda p: file_stamp(p))
+    def read(p):
+        with open(p) as f:
+            return f.read()
+
+    assert read(str(path)) == "one"
+    assert read(str(path)) == "one"
+    path.write_text("three")
+    assert read(str(path)) == "three"
+    assert read.cache_info().misses == 2
+
+
+def test_cached_threads():
+    @cached(maxsize=16)
+    def double(x):
+        return 2 * x
+
+    errors = []
+
+    def worker():
+        for i in range(1000):
+            if double(i % 32) != 2 * (i % 32):
+                errors.append(i)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    info = double.cache_info()
+    assert info.currsize <= 16
+    assert info.hits + info.misses == 8000